@@ -0,0 +1,529 @@
+"""Headless match rules for SPACE BATTLE.
+
+No pygame, display, audio or clock: a Match is plain data advanced one tick at
+a time by Match.step, which returns the events the tick produced. main.py's
+game loop drives the same engine, so bots and tests play by exactly the rules
+of the game.
+"""
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+WIDTH, HEIGHT = 900, 500
+BORDER_X, BORDER_WIDTH = WIDTH//2 - 5, 10
+VEL = 5
+BULLETS_VEL = 10
+MAX_BULLETS = 3
+MAX_HEALTH = 10
+SPACESHIP_WIDTH, SPACESHIP_HEIGHT = 55, 40
+BULLET_WIDTH, BULLET_HEIGHT = 14, 7
+# Ships may not go lower than this many pixels above the bottom edge
+BOTTOM_MARGIN = 15
+# The mouse-following ship stops moving once it is within this many pixels of the target
+FOLLOW_DEADZONE = 10
+
+# Bullet-hell variant: bullets per side, the vertical speeds of one spread shot, broadphase cell size
+HELL_MAX_BULLETS = 400
+HELL_SPREAD = (-2, -1, 0, 1, 2)
+GRID_CELL = 32
+
+FIRE = 'fire'
+HIT = 'hit'
+CANCEL = 'cancel'
+EXPIRE = 'expire'
+DEATH = 'death'
+WIN = 'win'
+
+# Columns of the per-player action arrays passed to MatchBatch.step
+LEFT, RIGHT, UP, DOWN, SHOOT = range(5)
+# Ship index in MatchBatch arrays, and values of its winner array
+YELLOW_SHIP, RED_SHIP = 0, 1
+NO_WINNER, YELLOW_WINS, RED_WINS = 0, 1, 2
+
+# Event `player` is 'yellow' or 'red':
+#   FIRE, CANCEL    the shooter
+#   EXPIRE          the shooter; the bullet left the screen
+#   HIT             the ship hit
+#   DEATH           the ship destroyed
+#   WIN             the winner; the round is over
+# The Bullet object in `bullet` is reused after the next step()
+Event = namedtuple('Event', ['kind', 'player', 'bullet'], defaults=[None])
+
+
+class PlayerInput:
+    """One player's controls for one tick.
+
+    `fire` is the number of shots requested this tick (True counts as one).
+    `target` is a point for the ship to follow (red's mouse scheme); when set,
+    the direction flags are ignored.
+    """
+    __slots__ = ('left', 'right', 'up', 'down', 'fire', 'target')
+
+    def __init__(self, left=False, right=False, up=False, down=False, fire=0, target=None):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+        self.fire = fire
+        self.target = target
+
+
+NO_INPUT = PlayerInput()
+
+
+class Bullet:
+    __slots__ = ('x', 'y', 'vy', 'id', 'index')
+    width = BULLET_WIDTH
+    height = BULLET_HEIGHT
+
+    def __init__(self, x, y, vy=0):
+        self.x = x
+        self.y = y
+        self.vy = vy
+        self.id = None
+        self.index = None
+
+
+class BulletStore:
+    """One ship's live bullets.
+
+    Every spawned bullet gets an integer id that is never handed out again by
+    the same `ids` counter, so renderers can key trails and effects on it.
+    Live bullets sit in a dense list (in no particular order) and despawn()
+    moves the last bullet into the freed place, so removal is O(1); despawned
+    Bullet objects go on a free list and are reused by later spawns.
+    """
+    def __init__(self, ids=None):
+        self.ids = itertools.count() if ids is None else ids
+        self.live = []
+        self.free = []
+
+    def spawn(self, x, y, vy=0):
+        if self.free:
+            bullet = self.free.pop()
+            bullet.x, bullet.y, bullet.vy = x, y, vy
+        else:
+            bullet = Bullet(x, y, vy)
+        bullet.id = next(self.ids)
+        bullet.index = len(self.live)
+        self.live.append(bullet)
+        return bullet
+
+    def despawn(self, bullet):
+        last = self.live.pop()
+        if last is not bullet:
+            self.live[bullet.index] = last
+            last.index = bullet.index
+        bullet.index = None
+        self.free.append(bullet)
+
+    def __len__(self):
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __getitem__(self, index):
+        return self.live[index]
+
+
+class Ship:
+    __slots__ = ('x', 'y', 'health', 'bullets')
+    width = SPACESHIP_WIDTH
+    height = SPACESHIP_HEIGHT
+
+    def __init__(self, x, y, health=MAX_HEALTH, bullet_ids=None):
+        self.x = x
+        self.y = y
+        self.health = health
+        self.bullets = BulletStore(bullet_ids)
+
+    def collides(self, bullet):
+        """pygame.Rect.colliderect for the ship and bullet rectangles"""
+        return (self.x < bullet.x + BULLET_WIDTH and bullet.x < self.x + SPACESHIP_WIDTH and
+                self.y < bullet.y + BULLET_HEIGHT and bullet.y < self.y + SPACESHIP_HEIGHT)
+
+
+class Match:
+    """One match between yellow (left half) and red (right half)"""
+    def __init__(self):
+        # Both ships draw bullet ids from one counter so ids are unique across the match
+        bullet_ids = itertools.count()
+        self.yellow = Ship(100, 300, bullet_ids=bullet_ids)
+        self.red = Ship(700, 300, bullet_ids=bullet_ids)
+        self.tick = 0
+        self.winner = None
+
+    def step(self, yellow_input=NO_INPUT, red_input=NO_INPUT):
+        """Advance one tick and return its events; once there is a winner this does nothing"""
+        if self.winner is not None:
+            return []
+        events = []
+        yellow, red = self.yellow, self.red
+        self.tick += 1
+
+        for _ in range(int(yellow_input.fire)):
+            self.shoot(yellow, 'yellow', yellow.x + SPACESHIP_WIDTH, events)
+        for _ in range(int(red_input.fire)):
+            self.shoot(red, 'red', red.x - BULLET_WIDTH, events)
+
+        move_yellow(yellow, yellow_input)
+        if red_input.target is None:
+            move_red(red, red_input)
+        else:
+            follow_target(red, red_input.target)
+
+        self.advance_bullets(events)
+
+        # A yellow loss takes precedence when both ships go down on the same tick
+        if yellow.health <= 0:
+            self.winner = 'red'
+        elif red.health <= 0:
+            self.winner = 'yellow'
+        if self.winner is not None:
+            events.append(Event(DEATH, 'yellow' if self.winner == 'red' else 'red'))
+            events.append(Event(WIN, self.winner))
+        return events
+
+    def shoot(self, ship, side, x, events):
+        if len(ship.bullets) < MAX_BULLETS:
+            bullet = ship.bullets.spawn(x, ship.y + SPACESHIP_HEIGHT//2 - 3)
+            events.append(Event(FIRE, side, bullet))
+
+    def advance_bullets(self, events):
+        yellow, red = self.yellow, self.red
+        for shooter, side, dx, target, target_side in ((yellow, 'yellow', BULLETS_VEL, red, 'red'),
+                                                       (red, 'red', -BULLETS_VEL, yellow, 'yellow')):
+            store = shooter.bullets
+            # Walking backwards, despawn only moves an already visited bullet into the freed place
+            for index in range(len(store) - 1, -1, -1):
+                bullet = store[index]
+                bullet.x += dx
+                if target.collides(bullet):
+                    target.health -= 1
+                    events.append(Event(HIT, target_side, bullet))
+                    store.despawn(bullet)
+                elif bullet.x > WIDTH or bullet.x < 0:
+                    events.append(Event(EXPIRE, side, bullet))
+                    store.despawn(bullet)
+
+    def snapshot(self):
+        """The full state as nested tuples of ints, for comparing and hashing"""
+        return (self.tick,
+                tuple((ship.x, ship.y, ship.health, tuple(sorted((b.x, b.y) for b in ship.bullets)))
+                      for ship in (self.yellow, self.red)))
+
+
+def move_yellow(ship, controls):
+    if controls.left and ship.x - VEL > 0:
+        ship.x -= VEL
+    if controls.right and ship.x + VEL + SPACESHIP_WIDTH < BORDER_X:
+        ship.x += VEL
+    if controls.up and ship.y - VEL > 0:
+        ship.y -= VEL
+    if controls.down and ship.y + VEL + SPACESHIP_HEIGHT < HEIGHT - BOTTOM_MARGIN:
+        ship.y += VEL
+
+
+def move_red(ship, controls):
+    if controls.left and ship.x - VEL > BORDER_X + BORDER_WIDTH:
+        ship.x -= VEL
+    if controls.right and ship.x + VEL + SPACESHIP_WIDTH < WIDTH:
+        ship.x += VEL
+    if controls.up and ship.y - VEL > 0:
+        ship.y -= VEL
+    if controls.down and ship.y + VEL + SPACESHIP_HEIGHT < HEIGHT - BOTTOM_MARGIN:
+        ship.y += VEL
+
+
+def follow_target(ship, target):
+    """Red's mouse scheme: step toward a target point on red's side of the border"""
+    target_x, target_y = target
+    center_x = ship.x + SPACESHIP_WIDTH // 2
+    center_y = ship.y + SPACESHIP_HEIGHT // 2
+
+    if target_x > BORDER_X + BORDER_WIDTH:
+        if center_x < target_x - FOLLOW_DEADZONE and ship.x + VEL + SPACESHIP_WIDTH < WIDTH:
+            ship.x += VEL
+        elif center_x > target_x + FOLLOW_DEADZONE and ship.x - VEL > BORDER_X + BORDER_WIDTH:
+            ship.x -= VEL
+
+        if center_y < target_y - FOLLOW_DEADZONE and ship.y + VEL + SPACESHIP_HEIGHT < HEIGHT - BOTTOM_MARGIN:
+            ship.y += VEL
+        elif center_y > target_y + FOLLOW_DEADZONE and ship.y - VEL > 0:
+            ship.y -= VEL
+
+
+def grid_keys(xy, width, height, cell):
+    """Keys of the grid cells covered by each width x height box at `xy`, and the box index for each key"""
+    first = xy // cell
+    last = (xy + (width - 1, height - 1)) // cell
+    keys = []
+    owners = []
+    index = np.arange(len(xy))
+    for dx in range((width - 1) // cell + 2):
+        for dy in range((height - 1) // cell + 2):
+            cx = first[:, 0] + dx
+            cy = first[:, 1] + dy
+            covered = (cx <= last[:, 0]) & (cy <= last[:, 1])
+            # Offset so boxes slightly off screen still get non-negative, unique keys
+            keys.append((cy[covered] + 1024) * 4096 + cx[covered] + 1024)
+            owners.append(index[covered])
+    return np.concatenate(keys), np.concatenate(owners)
+
+
+def overlapping_pairs(a_xy, a_size, b_xy, b_size, cell=GRID_CELL):
+    """Index pairs (i, j) where box a_xy[i] overlaps box b_xy[j], found through a uniform grid.
+
+    Boxes are hashed into every cell they cover; only boxes that share a cell
+    get the exact (strict, like pygame's colliderect) overlap test, so the cost
+    grows with the number of boxes rather than the number of pairs.
+    """
+    empty = np.zeros(0, dtype=np.intp)
+    if len(a_xy) == 0 or len(b_xy) == 0:
+        return empty, empty
+    a_keys, a_owner = grid_keys(a_xy, a_size[0], a_size[1], cell)
+    b_keys, b_owner = grid_keys(b_xy, b_size[0], b_size[1], cell)
+    order = np.argsort(b_keys, kind='stable')
+    b_keys = b_keys[order]
+    b_owner = b_owner[order]
+
+    start = np.searchsorted(b_keys, a_keys, 'left')
+    counts = np.searchsorted(b_keys, a_keys, 'right') - start
+    total = int(counts.sum())
+    if total == 0:
+        return empty, empty
+    i = np.repeat(a_owner, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = b_owner[np.repeat(start, counts) + offsets]
+
+    # Boxes spanning several shared cells show up more than once
+    pair_ids = np.unique(i * len(b_xy) + j)
+    i = pair_ids // len(b_xy)
+    j = pair_ids % len(b_xy)
+    a = a_xy[i]
+    b = b_xy[j]
+    hit = ((a[:, 0] < b[:, 0] + b_size[0]) & (b[:, 0] < a[:, 0] + a_size[0]) &
+           (a[:, 1] < b[:, 1] + b_size[1]) & (b[:, 1] < a[:, 1] + a_size[1]))
+    return i[hit], j[hit]
+
+
+def overlapping(box, size, xy, xy_size):
+    """Mask of the boxes at `xy` that overlap one box; a single vectorized test is already linear"""
+    return ((box[0] < xy[:, 0] + xy_size[0]) & (xy[:, 0] < box[0] + size[0]) &
+            (box[1] < xy[:, 1] + xy_size[1]) & (xy[:, 1] < box[1] + size[1]))
+
+
+class BulletHellMatch(Match):
+    """Match variant with hundreds of bullets per side.
+
+    Every shot is a fan of bullets with the vertical speeds in `spread`.
+    After bullets move, opposing bullets that touch cancel each other out
+    (CANCEL events), then the survivors are tested against the enemy ship.
+    Collisions go through the grid broadphase, so a tick stays roughly linear
+    in the bullet count.
+    """
+    def __init__(self, max_bullets=HELL_MAX_BULLETS, spread=HELL_SPREAD):
+        super().__init__()
+        self.max_bullets = max_bullets
+        self.spread = spread
+
+    def shoot(self, ship, side, x, events):
+        y = ship.y + SPACESHIP_HEIGHT//2 - 3
+        for vy in self.spread:
+            if len(ship.bullets) >= self.max_bullets:
+                break
+            events.append(Event(FIRE, side, ship.bullets.spawn(x, y, vy)))
+
+    def advance_bullets(self, events):
+        yellow, red = self.yellow, self.red
+        for store, side, dx in ((yellow.bullets, 'yellow', BULLETS_VEL), (red.bullets, 'red', -BULLETS_VEL)):
+            for index in range(len(store) - 1, -1, -1):
+                bullet = store[index]
+                bullet.x += dx
+                bullet.y += bullet.vy
+                if not (0 <= bullet.x <= WIDTH and -BULLET_HEIGHT < bullet.y < HEIGHT):
+                    events.append(Event(EXPIRE, side, bullet))
+                    store.despawn(bullet)
+
+        # Fixed copies of the dense lists: array indexes stay valid while bullets despawn below
+        yellow_bullets = list(yellow.bullets)
+        red_bullets = list(red.bullets)
+        size = (BULLET_WIDTH, BULLET_HEIGHT)
+        yellow_xy = bullet_positions(yellow_bullets)
+        red_xy = bullet_positions(red_bullets)
+        i, j = overlapping_pairs(yellow_xy, size, red_xy, size)
+        yellow_alive = np.ones(len(yellow_xy), dtype=bool)
+        red_alive = np.ones(len(red_xy), dtype=bool)
+        yellow_alive[i] = False
+        red_alive[j] = False
+        for index in np.flatnonzero(~yellow_alive):
+            events.append(Event(CANCEL, 'yellow', yellow_bullets[index]))
+            yellow.bullets.despawn(yellow_bullets[index])
+        for index in np.flatnonzero(~red_alive):
+            events.append(Event(CANCEL, 'red', red_bullets[index]))
+            red.bullets.despawn(red_bullets[index])
+
+        ship_size = (SPACESHIP_WIDTH, SPACESHIP_HEIGHT)
+        for shooter, bullets, alive, xy, target, side in (
+                (yellow, yellow_bullets, yellow_alive, yellow_xy, red, 'red'),
+                (red, red_bullets, red_alive, red_xy, yellow, 'yellow')):
+            if len(xy):
+                hit = alive & overlapping((target.x, target.y), ship_size, xy, size)
+                for index in np.flatnonzero(hit):
+                    target.health -= 1
+                    events.append(Event(HIT, side, bullets[index]))
+                    shooter.bullets.despawn(bullets[index])
+
+
+def bullet_positions(bullets):
+    return np.array([(bullet.x, bullet.y) for bullet in bullets], dtype=np.int64).reshape(-1, 2)
+
+
+class MatchBatch:
+    """N matches held in NumPy arrays and advanced together, one vectorized tick per step().
+
+    Follows Match.step exactly (same order of shooting, movement clamps,
+    bullet travel, collisions and win precedence) for the same constants; the
+    constants can be overridden per batch for balance tuning. Finished matches
+    are reset at the end of the step that finished them.
+
+    Arrays, ship axis ordered (YELLOW_SHIP, RED_SHIP):
+        pos           (n, 2, 2) ship x, y
+        health        (n, 2)
+        bullet_pos    (n, 2, max_bullets, 2), live where bullet_alive (n, 2, max_bullets)
+        tick          (n,) ticks played in the current match
+    """
+    def __init__(self, n, vel=VEL, bullets_vel=BULLETS_VEL, max_bullets=MAX_BULLETS,
+                 bottom_margin=BOTTOM_MARGIN, max_health=MAX_HEALTH):
+        self.n = n
+        self.vel = vel
+        self.bullets_vel = bullets_vel
+        self.max_bullets = max_bullets
+        self.floor = HEIGHT - bottom_margin
+        self.max_health = max_health
+        self.pos = np.zeros((n, 2, 2), dtype=np.int32)
+        self.health = np.zeros((n, 2), dtype=np.int32)
+        self.bullet_pos = np.zeros((n, 2, max_bullets, 2), dtype=np.int32)
+        self.bullet_alive = np.zeros((n, 2, max_bullets), dtype=bool)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.matches_played = 0
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new matches everywhere, or only where the boolean `mask` is set"""
+        rows = slice(None) if mask is None else mask
+        self.pos[rows] = ((100, 300), (700, 300))
+        self.health[rows] = self.max_health
+        self.bullet_alive[rows] = False
+        self.tick[rows] = 0
+
+    def step(self, yellow_actions, red_actions, red_targets=None, follow=None):
+        """Advance every match one tick.
+
+        `yellow_actions` and `red_actions` are (n, 5) integer arrays with columns
+        LEFT, RIGHT, UP, DOWN, SHOOT (SHOOT is a shot count). Where `follow` is
+        set (all matches if only `red_targets` is given), red follows the
+        (n, 2) `red_targets` points instead of its direction columns.
+
+        Returns (hits, winner): hits (n, 2) taken by each ship this tick, and
+        winner (n,) NO_WINNER/YELLOW_WINS/RED_WINS for matches that ended on
+        this tick and have been reset.
+        """
+        yellow_actions = np.asarray(yellow_actions)
+        red_actions = np.asarray(red_actions)
+        vel = self.vel
+        x = self.pos[:, :, 0]
+        y = self.pos[:, :, 1]
+        self.tick += 1
+
+        self._shoot(YELLOW_SHIP, yellow_actions[:, SHOOT], x[:, YELLOW_SHIP] + SPACESHIP_WIDTH)
+        self._shoot(RED_SHIP, red_actions[:, SHOOT], x[:, RED_SHIP] - BULLET_WIDTH)
+
+        # Yellow, then red; each clamp sees the result of the previous move like the scalar code
+        yx = x[:, YELLOW_SHIP]
+        yy = y[:, YELLOW_SHIP]
+        yx -= vel * ((yellow_actions[:, LEFT] != 0) & (yx - vel > 0))
+        yx += vel * ((yellow_actions[:, RIGHT] != 0) & (yx + vel + SPACESHIP_WIDTH < BORDER_X))
+        yy -= vel * ((yellow_actions[:, UP] != 0) & (yy - vel > 0))
+        yy += vel * ((yellow_actions[:, DOWN] != 0) & (yy + vel + SPACESHIP_HEIGHT < self.floor))
+
+        rx = x[:, RED_SHIP]
+        ry = y[:, RED_SHIP]
+        keys = np.ones(self.n, dtype=bool)
+        if red_targets is not None:
+            keys = np.zeros(self.n, dtype=bool) if follow is None else ~np.asarray(follow, dtype=bool)
+        self._move_red_keys(rx, ry, red_actions, keys)
+        if red_targets is not None:
+            self._follow(rx, ry, np.asarray(red_targets), ~keys)
+
+        hits = np.zeros((self.n, 2), dtype=np.int32)
+        hits[:, RED_SHIP] = self._advance_bullets(YELLOW_SHIP, self.bullets_vel, RED_SHIP)
+        hits[:, YELLOW_SHIP] = self._advance_bullets(RED_SHIP, -self.bullets_vel, YELLOW_SHIP)
+        self.health -= hits
+
+        winner = np.where(self.health[:, YELLOW_SHIP] <= 0, RED_WINS,
+                          np.where(self.health[:, RED_SHIP] <= 0, YELLOW_WINS, NO_WINNER)).astype(np.int8)
+        finished = winner != NO_WINNER
+        if finished.any():
+            self.matches_played += int(finished.sum())
+            self.reset(finished)
+        return hits, winner
+
+    def _shoot(self, ship, shots, bullet_x):
+        remaining = np.minimum(shots, self.max_bullets).astype(np.int32)
+        bullet_y = self.pos[:, ship, 1] + SPACESHIP_HEIGHT//2 - 3
+        for slot in range(self.max_bullets):
+            spawn = (remaining > 0) & ~self.bullet_alive[:, ship, slot]
+            self.bullet_alive[:, ship, slot] |= spawn
+            np.copyto(self.bullet_pos[:, ship, slot, 0], bullet_x, where=spawn)
+            np.copyto(self.bullet_pos[:, ship, slot, 1], bullet_y, where=spawn)
+            remaining -= spawn
+
+    def _move_red_keys(self, rx, ry, actions, active):
+        vel = self.vel
+        rx -= vel * (active & (actions[:, LEFT] != 0) & (rx - vel > BORDER_X + BORDER_WIDTH))
+        rx += vel * (active & (actions[:, RIGHT] != 0) & (rx + vel + SPACESHIP_WIDTH < WIDTH))
+        ry -= vel * (active & (actions[:, UP] != 0) & (ry - vel > 0))
+        ry += vel * (active & (actions[:, DOWN] != 0) & (ry + vel + SPACESHIP_HEIGHT < self.floor))
+
+    def _follow(self, rx, ry, targets, active):
+        vel = self.vel
+        target_x = targets[:, 0]
+        target_y = targets[:, 1]
+        center_x = rx + SPACESHIP_WIDTH // 2
+        center_y = ry + SPACESHIP_HEIGHT // 2
+        active = active & (target_x > BORDER_X + BORDER_WIDTH)
+
+        right = active & (center_x < target_x - FOLLOW_DEADZONE) & (rx + vel + SPACESHIP_WIDTH < WIDTH)
+        left = (active & ~(center_x < target_x - FOLLOW_DEADZONE) &
+                (center_x > target_x + FOLLOW_DEADZONE) & (rx - vel > BORDER_X + BORDER_WIDTH))
+        down = active & (center_y < target_y - FOLLOW_DEADZONE) & (ry + vel + SPACESHIP_HEIGHT < self.floor)
+        up = (active & ~(center_y < target_y - FOLLOW_DEADZONE) &
+              (center_y > target_y + FOLLOW_DEADZONE) & (ry - vel > 0))
+        rx += vel * right.astype(np.int32) - vel * left.astype(np.int32)
+        ry += vel * down.astype(np.int32) - vel * up.astype(np.int32)
+
+    def _advance_bullets(self, ship, dx, target):
+        """Move `ship`'s bullets by dx, remove those that hit `target` or leave the screen; returns hits per match"""
+        alive = self.bullet_alive[:, ship]
+        bx = self.bullet_pos[:, ship, :, 0]
+        by = self.bullet_pos[:, ship, :, 1]
+        bx += dx * alive
+        tx = self.pos[:, target, 0, None]
+        ty = self.pos[:, target, 1, None]
+        hit = (alive & (tx < bx + BULLET_WIDTH) & (bx < tx + SPACESHIP_WIDTH) &
+               (ty < by + BULLET_HEIGHT) & (by < ty + SPACESHIP_HEIGHT))
+        gone = (bx > WIDTH) if dx > 0 else (bx < 0)
+        alive &= ~(hit | gone)
+        return hit.sum(axis=1)
+
+    def snapshot(self, i):
+        """Match i in the same form as Match.snapshot()"""
+        ships = []
+        for ship in (YELLOW_SHIP, RED_SHIP):
+            bullets = tuple(sorted((int(self.bullet_pos[i, ship, slot, 0]), int(self.bullet_pos[i, ship, slot, 1]))
+                                   for slot in np.flatnonzero(self.bullet_alive[i, ship])))
+            ships.append((int(self.pos[i, ship, 0]), int(self.pos[i, ship, 1]), int(self.health[i, ship]), bullets))
+        return (int(self.tick[i]), tuple(ships))
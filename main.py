@@ -1,29 +1,53 @@
+import time
+module_started = time.perf_counter()
 import pygame
 import os
+import argparse
+import hashlib
+import struct
 import random
 import math
-pygame.init()
+import functools
+import itertools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import engine
+
+WIDTH, HEIGHT = engine.WIDTH, engine.HEIGHT
+FULLSCREEN = False
 
-try:
-    pygame.mixer.init()
-    AUDIO_ENABLED = True
-except pygame.error:
-    AUDIO_ENABLED = False
-    print("Audio device not available, continuing without sound.")
+display_change_hooks = []
+
+
+def on_display_change(hook):
+    """Register a callback run whenever the display is (re)created, e.g. to drop cached surfaces"""
+    display_change_hooks.append(hook)
+    return hook
 
-WIDTH, HEIGHT = 900, 500
-FULLSCREEN = False
 
-def init_display():
+def init_display(timings=None):
+    """Open (or reopen) the window and run the display-change hooks; `timings` collects (phase, seconds)"""
     global WIN, FULLSCREEN
+    started = time.perf_counter()
+    if not pygame.display.get_init():
+        pygame.display.init()
     if FULLSCREEN:
         WIN = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     else:
         WIN = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("SPACE BATTLE - Neon Edition")
+    if timings is not None:
+        timings.append(('display', time.perf_counter() - started))
+    for hook in display_change_hooks:
+        started = time.perf_counter()
+        hook()
+        if timings is not None:
+            timings.append((getattr(hook, '__qualname__', repr(hook)), time.perf_counter() - started))
     return WIN
 
-WIN = init_display()
+# The window is opened by startup(), not at import
+WIN = None
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -47,44 +71,251 @@ NEON_GREEN = (50, 255, 150)
 NEON_PURPLE = (200, 100, 255)
 ELECTRIC_BLUE = (100, 200, 255)
 
-BORDER = pygame.Rect(WIDTH//2 - 5, 0, 10, HEIGHT)
-
-if AUDIO_ENABLED:
-    BULLET_HIT_SOUND = pygame.mixer.Sound(os.path.join('Assets', 'Grenade+1.mp3'))
-    BULLET_FIRE_SOUND = pygame.mixer.Sound(os.path.join('Assets', 'Gun+Silencer.mp3'))
-    BULLET_HIT_SOUND.set_volume(0.3)
-    BULLET_FIRE_SOUND.set_volume(0.3)
-else:
-    BULLET_HIT_SOUND = None
-    BULLET_FIRE_SOUND = None
-
-HEALTH_FONT = pygame.font.SysFont('arial', 20, bold=True)
-WINNER_FONT = pygame.font.SysFont('arial', 80, bold=True)
-TITLE_FONT = pygame.font.SysFont('arial', 70, bold=True)
-INSTRUCTION_FONT = pygame.font.SysFont('arial', 24)
-BULLET_COUNT_FONT = pygame.font.SysFont('arial', 18, bold=True)
-MENU_FONT = pygame.font.SysFont('arial', 28, bold=True)
-SMALL_FONT = pygame.font.SysFont('arial', 16)
-HUGE_FONT = pygame.font.SysFont('arial', 100, bold=True)
+BORDER = pygame.Rect(engine.BORDER_X, 0, engine.BORDER_WIDTH, HEIGHT)
+
+class AssetLoader:
+    """Runs asset loads on a worker thread and hands out futures, so only their users wait.
+
+    submit() is idempotent per name: asking for an asset that is already loading
+    returns the same future. `times` holds how long each load took on the worker.
+    """
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.executor = None
+        self.futures = {}
+        self.times = {}
+
+    def submit(self, name, load):
+        future = self.futures.get(name)
+        if future is None:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='assets')
+            future = self.futures[name] = self.executor.submit(self.timed, name, load)
+        return future
+
+    def timed(self, name, load):
+        started = time.perf_counter()
+        try:
+            return load()
+        finally:
+            self.times[name] = time.perf_counter() - started
+
+    def ready(self, name):
+        future = self.futures.get(name)
+        return future is not None and future.done()
+
+    def wait(self):
+        for future in list(self.futures.values()):
+            future.exception()
+
+
+loader = AssetLoader()
+
+SOUNDS = {
+    'hit': ('Grenade+1.mp3', 0.3),
+    'fire': ('Gun+Silencer.mp3', 0.3),
+}
+
+FONTS = {
+    'health': ('arial', 20, True),
+    'winner': ('arial', 80, True),
+    'title': ('arial', 70, True),
+    'instruction': ('arial', 24, False),
+    'bullet_count': ('arial', 18, True),
+    'menu': ('arial', 28, True),
+    'small': ('arial', 16, False),
+    'huge': ('arial', 100, True),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def audio_enabled():
+    """Start the mixer on first use, which must be on the main thread; False when there is no audio device"""
+    try:
+        pygame.mixer.init()
+        return True
+    except pygame.error:
+        print("Audio device not available, continuing without sound.")
+        return False
+
+
+def load_sound(name):
+    """Decode one sound; runs on the loader thread once the mixer is up"""
+    filename, volume = SOUNDS[name]
+    sound = pygame.mixer.Sound(os.path.join('Assets', filename))
+    sound.set_volume(volume)
+    return sound
+
+
+def preload_sounds():
+    if not audio_enabled():
+        return
+    for name in SOUNDS:
+        loader.submit('sound ' + name, functools.partial(load_sound, name))
+
+
+def get_sound(name):
+    """The loaded sound, waiting for the background load if it has not finished"""
+    if not audio_enabled():
+        return None
+    return loader.submit('sound ' + name, functools.partial(load_sound, name)).result()
+
+
+def play_sound(name):
+    sound = get_sound(name)
+    if sound is not None:
+        sound.play()
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name):
+    """Resolve a FONTS entry once; every SysFont lookup searches the system font list"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    face, size, bold = FONTS[name]
+    return pygame.font.SysFont(face, size, bold=bold)
 
 FPS = 60
-VEL = 5
-BULLETS_VEL = 10
-MAX_BULLETS = 3
-SPACESHIP_WIDTH, SPACESHIP_HEIGHT = 55, 40
+# Match logic runs at a fixed TICK_RATE; ship and bullet speeds, drag, flashes and shake decay are per tick
+TICK_RATE = 60
+# Frame cap during a match (0 = uncapped); ships and bullets are interpolated between ticks
+RENDER_FPS = FPS
+# Longest frame the simulation catches up on, so a stall doesn't trigger a burst of ticks
+MAX_FRAME_TIME = 0.25
+MAX_BULLETS = engine.MAX_BULLETS
+SPACESHIP_WIDTH, SPACESHIP_HEIGHT = engine.SPACESHIP_WIDTH, engine.SPACESHIP_HEIGHT
+
+PRIORITY_AMBIENT = 0
+PRIORITY_EXHAUST = 1
+PRIORITY_EFFECT = 2
+PRIORITY_IMPACT = 3
+
+# emitter: (priority, max particles spawned per frame; per tick during a match)
+EMITTERS = {
+    'shooting_star': (PRIORITY_AMBIENT, 4),
+    'thruster': (PRIORITY_EXHAUST, 12),
+    'muzzle': (PRIORITY_EFFECT, 40),
+    'explosion': (PRIORITY_EFFECT, 120),
+    'hit': (PRIORITY_IMPACT, 160),
+    'victory': (PRIORITY_IMPACT, 400),
+}
+THRUSTER_SPAWN_RATE = 180
+THRUSTER_IDLE_SPAWN_RATE = 60
+STAR_LAYER_COUNTS = (60, 35, 20)
+MAX_SHOOTING_STARS = 24
+SHOOTING_STAR_CHANCE = 0.01
+METEOR_SHOWER_CHANCE = 0.2
+PULSE_COLOR_STEP = 6
+HUD_ANIMATED_TRANSITIONS = False
+SCALE_MODE = 'nearest'
+DIRTY_RECT_UPDATES = False
+ASSET_CACHE_DIR = '.asset_cache'
+# Trails of despawned bullets shrink away one point per tick instead of vanishing
+ORPHAN_TRAILS = True
+# Queue game events until the end of the tick instead of calling subscribers as they are published
+BATCH_GAME_EVENTS = False
+FIRST_FRAME_BUDGET = 0.5
+
+class AssetManager:
+    """Images loaded, scaled, rotated and converted to the display pixel format once.
+
+    The scaled and rotated pixels are kept in an on-disk cache under
+    `cache_dir`, keyed by the source file's hash, the target size and the
+    rotation, so later launches skip decoding and transforming. Bumping VERSION
+    orphans every cached file. convert()/convert_alpha() is redone by
+    reconvert() whenever the display changes.
+    """
+    VERSION = 1
+
+    def __init__(self, directory, cache_dir):
+        self.directory = directory
+        self.cache_dir = os.path.join(cache_dir, 'v%d' % self.VERSION)
+        self.specs = {}
+        self.baked = {}
+        self.surfaces = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, name, filename, size, angle=0, alpha=True):
+        self.specs[name] = (filename, tuple(size), angle, alpha)
+
+    def cache_path(self, name):
+        filename, size, angle, alpha = self.specs[name]
+        with open(os.path.join(self.directory, filename), 'rb') as source:
+            digest = hashlib.sha1(source.read()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, '%s-%s-%dx%d-r%d-%s.raw' % (
+            os.path.splitext(filename)[0], digest, size[0], size[1], angle, 'rgba' if alpha else 'rgb'))
+
+    def read_cache(self, path, alpha):
+        try:
+            with open(path, 'rb') as cached:
+                width, height = struct.unpack('<II', cached.read(8))
+                return pygame.image.frombytes(cached.read(), (width, height), 'RGBA' if alpha else 'RGB')
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def write_cache(self, path, surface, alpha):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            partial = path + '.tmp'
+            with open(partial, 'wb') as cached:
+                cached.write(struct.pack('<II', *surface.get_size()))
+                cached.write(pygame.image.tobytes(surface, 'RGBA' if alpha else 'RGB'))
+            os.replace(partial, path)
+        except OSError:
+            pass
+
+    def bake(self, name):
+        """Scaled and rotated pixels for `name`, from the disk cache when possible"""
+        filename, size, angle, alpha = self.specs[name]
+        path = self.cache_path(name)
+        surface = self.read_cache(path, alpha)
+        if surface is not None:
+            self.cache_hits += 1
+            return surface
+        self.cache_misses += 1
+        surface = pygame.transform.scale(pygame.image.load(os.path.join(self.directory, filename)), size)
+        if angle:
+            surface = pygame.transform.rotate(surface, angle)
+        self.write_cache(path, surface, alpha)
+        return surface
+
+    def preload(self):
+        """Start baking every image on the loader thread"""
+        for name in self.specs:
+            loader.submit('image ' + name, functools.partial(self.bake, name))
+
+    def ready(self, name):
+        return name in self.baked or loader.ready('image ' + name)
+
+    def get(self, name):
+        """`name` in the display format, waiting for its background load if it has not finished"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            baked = self.baked.get(name)
+            if baked is None:
+                baked = loader.submit('image ' + name, functools.partial(self.bake, name)).result()
+                self.baked[name] = baked
+            surface = to_display_format(baked, self.specs[name][3])
+            self.surfaces[name] = surface
+        return surface
+
+    def reconvert(self):
+        self.surfaces.clear()
+
+
+assets = AssetManager('Assets', ASSET_CACHE_DIR)
+assets.add('yellow_ship', 'spaceship_yellow.png', (SPACESHIP_WIDTH, SPACESHIP_HEIGHT), 90)
+assets.add('red_ship', 'spaceship_red.png', (SPACESHIP_WIDTH, SPACESHIP_HEIGHT), 270)
+assets.add('space', 'space.jpg', (WIDTH, HEIGHT), alpha=False)
+
+
+@on_display_change
+def load_assets():
+    """Drop surfaces converted for the old display and make sure every image is loading"""
+    assets.reconvert()
+    assets.preload()
 
-YELLOW_HIT = pygame.USEREVENT + 1
-RED_HIT = pygame.USEREVENT + 2
-
-YELLOW_SPACESHIP_IMAGE = pygame.image.load(os.path.join('Assets', 'spaceship_yellow.png'))
-YELLOW_SPACESHIP = pygame.transform.rotate(pygame.transform.scale(
-    YELLOW_SPACESHIP_IMAGE, (SPACESHIP_WIDTH, SPACESHIP_HEIGHT)), 90)
-
-RED_SPACESHIP_IMAGE = pygame.image.load(os.path.join('Assets', 'spaceship_red.png'))
-RED_SPACESHIP = pygame.transform.rotate(pygame.transform.scale(
-    RED_SPACESHIP_IMAGE, (SPACESHIP_WIDTH, SPACESHIP_HEIGHT)), 270)
-
-SPACE = pygame.transform.scale(pygame.image.load(os.path.join('Assets', 'space.jpg')), (WIDTH, HEIGHT))
 
 screen_shake_amount = 0
 screen_shake_decay = 0.85
@@ -96,30 +327,294 @@ def toggle_fullscreen():
     init_display()
 
 
-def render_game_surface():
-    """Create a surface for the game that can be scaled in fullscreen"""
-    return pygame.Surface((WIDTH, HEIGHT))
+def to_display_format(surface, alpha=False):
+    """`surface` converted to the window's pixel format for fast blits; unchanged before the window opens"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
 
 
-def display_surface(game_surface):
-    """Display the game surface, scaled if in fullscreen"""
-    if FULLSCREEN:
+class FrameBuffers:
+    """Persistent display-format surfaces handed out every frame instead of allocating new ones.
+
+    `allocations` counts every surface created here; in steady-state play it
+    stops growing after the first frames.
+    """
+    def __init__(self):
+        self.surfaces = {}
+        self.allocations = 0
+
+    def get(self, name, size=(WIDTH, HEIGHT), flags=0):
+        key = (name, size, flags)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = to_display_format(pygame.Surface(size, flags), flags & pygame.SRCALPHA)
+            self.surfaces[key] = surface
+            self.allocations += 1
+        return surface
+
+    def invalidate(self):
+        self.surfaces.clear()
+
+
+def display_format():
+    """Pixel format of the window (None before it opens), to tell whether converted surfaces went stale"""
+    surface = pygame.display.get_surface()
+    if surface is None:
+        return None
+    return surface.get_bitsize(), surface.get_masks()
+
+
+frame_buffers = FrameBuffers()
+on_display_change(frame_buffers.invalidate)
+
+
+def render_game_surface():
+    """Surface for the game that can be scaled in fullscreen; the same buffer is reused every frame"""
+    return frame_buffers.get('frame')
+
+
+def apply_screen_shake(surface, shake_x, shake_y):
+    """Return `surface` offset by the shake, drawn into a second persistent buffer"""
+    if shake_x == 0 and shake_y == 0:
+        return surface
+    shaken = frame_buffers.get('shaken')
+    shaken.fill(BLACK)
+    shaken.blit(surface, (shake_x, shake_y))
+    return shaken
+
+
+class Viewport:
+    """Maps the WIDTH x HEIGHT game surface onto the window, computed once per display mode.
+
+    Modes: 'nearest' (transform.scale), 'smooth' (transform.smoothscale) and
+    'integer' (nearest at the largest whole-number factor that fits). The scaled
+    frame goes into a preallocated surface, and the letterbox bars are filled
+    only after the display changes.
+    """
+    MODES = ('nearest', 'smooth', 'integer')
+
+    def __init__(self, mode='nearest'):
+        self.scale = 1
+        self.size = (WIDTH, HEIGHT)
+        self.offset = (0, 0)
+        self.scaled = None
+        self.letterbox_pending = False
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        if mode not in self.MODES:
+            raise ValueError("scale mode must be one of %s" % (self.MODES,))
+        self.mode = mode
+        if WIN is not None:
+            self.update()
+
+    def update(self):
         screen_w, screen_h = WIN.get_size()
-        scale_factor = min(screen_w / WIDTH, screen_h / HEIGHT)
-        scaled_w = int(WIDTH * scale_factor)
-        scaled_h = int(HEIGHT * scale_factor)
-        scaled_surface = pygame.transform.scale(game_surface, (scaled_w, scaled_h))
+        if FULLSCREEN:
+            self.scale = min(screen_w / WIDTH, screen_h / HEIGHT)
+            if self.mode == 'integer':
+                self.scale = max(1, int(self.scale))
+        else:
+            self.scale = 1
+        self.size = (int(WIDTH * self.scale), int(HEIGHT * self.scale))
         
         # Center the game
-        x_offset = (screen_w - scaled_w) // 2
-        y_offset = (screen_h - scaled_h) // 2
-        
-        WIN.fill(BLACK)
-        WIN.blit(scaled_surface, (x_offset, y_offset))
-    else:
-        WIN.blit(game_surface, (0, 0))
-    
-    pygame.display.update()
+        self.offset = ((screen_w - self.size[0]) // 2, (screen_h - self.size[1]) // 2)
+        self.scaled = None
+        if self.size != (WIDTH, HEIGHT):
+            self.scaled = to_display_format(pygame.Surface(self.size))
+        self.letterbox_pending = self.size != (screen_w, screen_h)
+
+    def present(self, game_surface):
+        if self.letterbox_pending:
+            WIN.fill(BLACK)
+            self.letterbox_pending = False
+        if self.scaled is None:
+            WIN.blit(game_surface, self.offset)
+            return
+        if self.mode == 'smooth':
+            pygame.transform.smoothscale(game_surface, self.size, self.scaled)
+        else:
+            pygame.transform.scale(game_surface, self.size, self.scaled)
+        WIN.blit(self.scaled, self.offset)
+
+    def to_window(self, rect):
+        """Window rect covering a game-surface rect, padded for rounding when scaled"""
+        if self.scaled is None:
+            return rect.move(self.offset)
+        return pygame.Rect(int(rect.x * self.scale) + self.offset[0] - 1,
+                           int(rect.y * self.scale) + self.offset[1] - 1,
+                           math.ceil(rect.width * self.scale) + 2,
+                           math.ceil(rect.height * self.scale) + 2)
+
+    def to_game(self, pos):
+        """Convert a window position (e.g. the mouse) to game-surface coordinates"""
+        return (int((pos[0] - self.offset[0]) / self.scale),
+                int((pos[1] - self.offset[1]) / self.scale))
+
+
+viewport = Viewport(SCALE_MODE)
+on_display_change(viewport.update)
+
+
+class DirtyRects:
+    """Screen regions drawn this frame, so display.update only pushes what changed.
+
+    Draw code reports the rects it touched with add(). Each flush pushes this
+    frame's rects plus last frame's (to clear where things moved from). Anything
+    that changes the whole frame - switching screens, screen shake, a display
+    change - calls invalidate_all() for a full update.
+    When disabled every flush is a full update and add() does nothing.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.rects = []
+        self.previous = []
+        self.full = True
+        self.screen = None
+        self.shake = (0, 0)
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def add(self, rect):
+        if self.enabled:
+            self.rects.append(rect)
+        return rect
+
+    def add_all(self, rects):
+        if self.enabled:
+            self.rects.extend(rects)
+
+    def invalidate_all(self):
+        self.full = True
+
+    def begin(self, screen, shake=(0, 0)):
+        """Note which screen and shake offset this frame is shown with"""
+        if screen != self.screen or shake != self.shake or shake != (0, 0):
+            self.full = True
+        self.screen = screen
+        self.shake = shake
+
+    def flush(self):
+        if not self.enabled or self.full:
+            pygame.display.update()
+            self.full_updates += 1
+        else:
+            window = WIN.get_rect()
+            rects = [viewport.to_window(pygame.Rect(rect)).clip(window) for rect in self.rects + self.previous]
+            pygame.display.update(rects)
+            self.partial_updates += 1
+        self.previous = self.rects
+        self.rects = []
+        self.full = False
+
+
+dirty_rects = DirtyRects(DIRTY_RECT_UPDATES)
+on_display_change(dirty_rects.invalidate_all)
+
+
+def display_surface(game_surface):
+    """Display the game surface, scaled if in fullscreen"""
+    viewport.present(game_surface)
+    
+    dirty_rects.flush()
+    particle_budget.next_frame()
+    game_events.next_frame()
+
+
+class ParticleBudget:
+    """Shared particle budget every emitter must request capacity from.
+
+    Each emitter has a priority and a per-frame spawn cap. A request is granted
+    only while the live particle count stays under the share of `live_limit`
+    its priority may use, so low-priority exhaust leaves headroom for hits.
+    """
+    PRIORITY_SHARE = {
+        PRIORITY_AMBIENT: 0.25,
+        PRIORITY_EXHAUST: 0.5,
+        PRIORITY_EFFECT: 0.75,
+        PRIORITY_IMPACT: 1.0,
+    }
+
+    def __init__(self, live_count, live_limit=3000, emitters=None):
+        self.live_count = live_count
+        self.live_limit = live_limit
+        self.emitters = dict(EMITTERS if emitters is None else emitters)
+        self.spawned = dict.fromkeys(self.emitters, 0)
+        self.denied = dict.fromkeys(self.emitters, 0)
+
+    def request(self, emitter, count):
+        """Return how many of `count` particles `emitter` may spawn right now"""
+        priority, frame_cap = self.emitters[emitter]
+        limit = int(self.live_limit * self.PRIORITY_SHARE[priority])
+        # Emitters spawn as soon as they are granted, so live_count() already includes this frame's spawns
+        available = min(frame_cap - self.spawned[emitter], limit - self.live_count())
+        granted = max(0, min(count, available))
+        self.spawned[emitter] += granted
+        self.denied[emitter] += count - granted
+        return granted
+
+    def next_frame(self):
+        for emitter in self.spawned:
+            self.spawned[emitter] = 0
+
+
+class GameEvents:
+    """In-process bus for the engine's game events (FIRE, HIT, EXPIRE, DEATH, WIN, ...).
+
+    Keeps game events off SDL's queue, which only carries OS input, so a hit is
+    handled on the tick it happens. Subscribers are registered per event kind.
+    publish() calls them right away, or with `batched` holds the event until
+    flush(). `counts` and `dispatch_time` cover the frame being built;
+    `last_counts` and `last_dispatch_time` hold the previous frame's.
+    """
+    def __init__(self, batched=BATCH_GAME_EVENTS):
+        self.batched = batched
+        self.subscribers = {}
+        self.pending = []
+        self.counts = {}
+        self.dispatch_time = 0.0
+        self.last_counts = {}
+        self.last_dispatch_time = 0.0
+
+    def subscribe(self, kind, handler=None):
+        """Call handler(event) for every event of `kind`; also works as a decorator"""
+        if handler is None:
+            return lambda handler: self.subscribe(kind, handler)
+        self.subscribers.setdefault(kind, []).append(handler)
+        return handler
+
+    def reset(self):
+        """Drop all subscribers and undelivered events, e.g. when a new match starts"""
+        self.subscribers.clear()
+        self.pending.clear()
+
+    def publish(self, event):
+        if self.batched:
+            self.pending.append(event)
+        else:
+            self.dispatch(event)
+
+    def flush(self):
+        pending = self.pending
+        self.pending = []
+        for event in pending:
+            self.dispatch(event)
+
+    def dispatch(self, event):
+        started = time.perf_counter()
+        for handler in self.subscribers.get(event.kind, ()):
+            handler(event)
+        self.dispatch_time += time.perf_counter() - started
+        self.counts[event.kind] = self.counts.get(event.kind, 0) + 1
+
+    def next_frame(self):
+        self.last_counts, self.counts = self.counts, {}
+        self.last_dispatch_time, self.dispatch_time = self.dispatch_time, 0.0
+
+
+game_events = GameEvents()
 
 
 class Star:
@@ -138,32 +633,100 @@ class Star:
         self.color_shift = random.choice([
             (0, 0, 0), (30, 0, 0), (0, 0, 30), (20, 20, 0), (0, 20, 20)
         ])
-        
-    def reset(self):
-        self.x = WIDTH + random.randint(10, 50)
-        self.y = random.randint(0, HEIGHT)
-        self.reset_properties()
-            
-    def update(self):
-        self.x -= self.speed
-        if self.x < -5:
-            self.reset()
             
-    def draw(self, surface, time):
-        twinkle = math.sin(time * self.twinkle_speed + self.twinkle_offset) * 0.4 + 0.6
+    def draw(self, surface, twinkle, x_offset=0):
         brightness = int(self.brightness * twinkle)
         r = min(255, brightness + self.color_shift[0])
         g = min(255, brightness + self.color_shift[1])
         b = min(255, brightness + self.color_shift[2])
+        center = (int(self.x) + x_offset, int(self.y))
         
         if self.size > 1 and twinkle > 0.8:
             glow_color = (r//3, g//3, b//3)
-            pygame.draw.circle(surface, glow_color, (int(self.x), int(self.y)), self.size + 2)
+            pygame.draw.circle(surface, glow_color, center, self.size + 2)
         
-        pygame.draw.circle(surface, (r, g, b), (int(self.x), int(self.y)), self.size)
+        pygame.draw.circle(surface, (r, g, b), center, self.size)
+
+
+class StarField:
+    """Parallax star layers baked into wrap-around strips, drawn with one blit per layer.
+
+    Each layer scrolls at the average speed of its stars. Twinkle is baked into
+    brightness frames spanning `cycle` game frames, with each star's twinkle
+    speed rounded to a whole number of waves per cycle so the loop is seamless.
+    A layer gets `samples_per_wave` frames per wave of its fastest star, and
+    each frame is baked the first time it is drawn. Strips are RLE colorkey
+    surfaces, so memory and blit cost follow the number of star pixels rather
+    than the strip area. With dirty rects on, draw() reports the box of every
+    visible star instead of the whole frame.
+    """
+    def __init__(self, layers, samples_per_wave=16, cycle=126):
+        self.layers = layers
+        self.cycle = cycle
+        self.speeds = [sum(star.speed for star in stars) / len(stars) for stars in layers]
+        self.waves = [[max(1, round(star.twinkle_speed * cycle / (math.pi * 2))) for star in stars]
+                      for stars in layers]
+        self.frame_counts = [samples_per_wave * max(waves) for waves in self.waves]
+        self.scroll = [0.0] * len(layers)
+        self.strips = None
+        self.format = None
+        # Per layer: left, top and size of the box each star (glow included) covers in its strip
+        self.boxes = []
+        for stars in layers:
+            radius = np.array([star.size + 2 for star in stars])
+            self.boxes.append((np.array([int(star.x) for star in stars]) - radius,
+                               np.array([int(star.y) for star in stars]) - radius,
+                               radius * 2 + 1))
+
+    def bake_frame(self, layer, frame):
+        phase = frame / self.frame_counts[layer] * math.pi * 2
+        strip = to_display_format(pygame.Surface((WIDTH * 2, HEIGHT)))
+        for star, k in zip(self.layers[layer], self.waves[layer]):
+            twinkle = math.sin(phase * k + star.twinkle_offset) * 0.4 + 0.6
+            star.draw(strip, twinkle)
+            star.draw(strip, twinkle, WIDTH)
+        strip.set_colorkey(BLACK, pygame.RLEACCEL)
+        # The first blit RLE-encodes the strip and releases its raw pixels
+        pygame.Surface((1, 1)).blit(strip, (0, 0))
+        self.strips[layer][frame] = strip
+        return strip
+
+    def reset(self):
+        self.strips = [[None] * count for count in self.frame_counts]
+        self.format = display_format()
+
+    def invalidate(self):
+        """The game surface keeps its size, so strips only go stale if the pixel format changed"""
+        if self.format != display_format():
+            self.strips = None
+
+    def draw(self, surface, time):
+        if self.strips is None:
+            self.reset()
+        for i, frames in enumerate(self.strips):
+            frame = int(time * len(frames) / self.cycle) % len(frames)
+            strip = frames[frame] or self.bake_frame(i, frame)
+            self.scroll[i] = (self.speeds[i] * time) % WIDTH
+            surface.blit(strip, (0, 0), (int(self.scroll[i]), 0, WIDTH, HEIGHT))
+        if dirty_rects.enabled:
+            self.add_dirty_rects()
+
+    def add_dirty_rects(self):
+        """Report every visible star's box; stars move or twinkle on most frames, and
+        last frame's boxes are pushed again by DirtyRects to clear where they were"""
+        for (left, top, size), scroll in zip(self.boxes, self.scroll):
+            # Each star is in the strip twice, WIDTH apart
+            for x in (left - int(scroll), left - int(scroll) + WIDTH):
+                visible = (x < WIDTH) & (x + size > 0)
+                sizes = size[visible].tolist()
+                dirty_rects.add_all(zip(x[visible].tolist(), top[visible].tolist(), sizes, sizes))
 
 
 class ShootingStar:
+    ANGLE_BUCKETS = 8
+    LENGTH_STEP = 10
+    sprites = {}
+
     def __init__(self):
         self.reset()
         
@@ -175,17 +738,50 @@ class ShootingStar:
         self.vy = 0
         self.length = 0
         self.lifetime = 0
+        self.sprite = None
+        self.offset = (0, 0)
         
     def spawn(self):
+        if particle_budget.request('shooting_star', 1) == 0:
+            return
         self.active = True
         self.x = random.randint(WIDTH//2, WIDTH)
         self.y = random.randint(0, HEIGHT//3)
         speed = random.randint(15, 25)
-        angle = random.random() * 0.5 + 0.2
+        # Snap to the angle and length a pre-rendered streak exists for
+        bucket = random.randrange(self.ANGLE_BUCKETS)
+        angle = 0.2 + (bucket + 0.5) / self.ANGLE_BUCKETS * 0.5
         self.vx = -speed * math.cos(angle)
         self.vy = speed * math.sin(angle)
-        self.length = random.randint(30, 60)
+        self.length = round(random.randint(30, 60) / self.LENGTH_STEP) * self.LENGTH_STEP
         self.lifetime = 60
+        self.sprite, self.offset = self.get_sprite(speed, bucket, self.length, self.vx, self.vy)
+        
+    @classmethod
+    def get_sprite(cls, speed, bucket, length, vx, vy):
+        """Streak for one speed/angle/length bucket at full brightness, with its offset from the head"""
+        key = (speed, bucket, length)
+        if key not in cls.sprites:
+            points = []
+            for i in range(length):
+                t = i / length
+                points.append((-vx * t * 0.5, -vy * t * 0.5, int(255 * (1 - t)), max(1, int(3 * (1 - t)))))
+            left = int(min(px for px, _, _, _ in points)) - 3
+            top = int(min(py for _, py, _, _ in points)) - 3
+            right = int(max(px for px, _, _, _ in points)) + 4
+            bottom = int(max(py for _, py, _, _ in points)) + 4
+            sprite = pygame.Surface((right - left, bottom - top))
+            for px, py, brightness, size in points:
+                pygame.draw.circle(sprite, (brightness, brightness, brightness),
+                                   (int(px) - left, int(py) - top), size)
+            sprite = to_display_format(sprite)
+            sprite.set_colorkey(BLACK)
+            cls.sprites[key] = (sprite, (left, top))
+        return cls.sprites[key]
+
+    @classmethod
+    def invalidate(cls):
+        cls.sprites.clear()
         
     def update(self):
         if self.active:
@@ -197,24 +793,106 @@ class ShootingStar:
                 
     def draw(self, surface):
         if self.active:
-            alpha = self.lifetime / 60
-            for i in range(self.length):
-                t = i / self.length
-                px = self.x - self.vx * t * 0.5
-                py = self.y - self.vy * t * 0.5
-                brightness = int(255 * (1 - t) * alpha)
-                size = max(1, int(3 * (1 - t)))
-                if brightness > 0:
-                    pygame.draw.circle(surface, (brightness, brightness, brightness), 
-                                      (int(px), int(py)), size)
+            self.sprite.set_alpha(int(255 * self.lifetime / 60))
+            dirty_rects.add(surface.blit(self.sprite, (int(self.x) + self.offset[0], int(self.y) + self.offset[1])))
+
+
+class GlowSpriteCache:
+    """LRU cache of pre-rendered glow sprites, blitted additively instead of drawing circles.
+
+    Particle sprites are keyed by quantized (color, alpha, glow radius, core radius)
+    and ring sprites by quantized (color, radius, width). Least recently used
+    sprites are evicted once the cache holds more than `max_bytes` of pixels.
+    Rings wider than `max_ring_radius` are cheaper to draw directly than to blit.
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024, color_step=8, alpha_levels=32, max_ring_radius=48):
+        self.max_bytes = max_bytes
+        self.max_ring_radius = max_ring_radius
+        self.color_step = color_step
+        self.alpha_levels = alpha_levels
+        self.sprites = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize_color(self, color):
+        step = self.color_step
+        return (int(color[0]) // step * step, int(color[1]) // step * step, int(color[2]) // step * step)
+
+    def get(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        sprite = self.render_ring(*key[1:]) if key[0] == 'ring' else self.render_particle(*key)
+        self.sprites[key] = sprite
+        self.bytes += sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, old = self.sprites.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+            self.evictions += 1
+        return sprite
+
+    def particle_key(self, color, alpha, glow_radius, core_radius):
+        r, g, b = self.quantize_color(color)
+        return (r, g, b, round(alpha * self.alpha_levels), glow_radius, core_radius)
+
+    def ring_key(self, color, radius, width):
+        return ('ring',) + self.quantize_color(color) + (radius, width)
+
+    def render_particle(self, r, g, b, alpha_level, glow_radius, core_radius):
+        alpha = alpha_level / self.alpha_levels
+        color = (min(255, int(r * alpha)), min(255, int(g * alpha)), min(255, int(b * alpha)))
+        extent = max(glow_radius, core_radius)
+        sprite = new_sprite_surface(extent * 2 + 1)
+        if glow_radius:
+            pygame.draw.circle(sprite, (color[0]//3, color[1]//3, color[2]//3), (extent, extent), glow_radius)
+        pygame.draw.circle(sprite, color, (extent, extent), core_radius)
+        return sprite
+
+    def render_ring(self, r, g, b, radius, width):
+        sprite = new_sprite_surface(radius * 2 + 1)
+        pygame.draw.circle(sprite, (r, g, b), (radius, radius), radius, width)
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'sprites': len(self.sprites),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def new_sprite_surface(diameter):
+    return to_display_format(pygame.Surface((diameter, diameter)))
+
+
+glow_sprites = GlowSpriteCache()
 
 
 class Particle:
+    __slots__ = ('x', 'y', 'vx', 'vy', 'color', 'size', 'original_size', 'lifetime',
+                 'max_lifetime', 'gravity', 'alive', 'fade', 'born', 'slot')
+
     def __init__(self, x, y, color, velocity=None, size=3, lifetime=30, gravity=0, fade=True):
+        self.slot = -1
+        self.born = 0
+        self.reset(x, y, color, velocity, size, lifetime, gravity, fade)
+
+    def reset(self, x, y, color, velocity=None, size=3, lifetime=30, gravity=0, fade=True):
         self.x = x
         self.y = y
         self.color = color
-        self.original_color = color
         if velocity:
             self.vx, self.vy = velocity
         else:
@@ -229,8 +907,6 @@ class Particle:
         self.gravity = gravity
         self.alive = True
         self.fade = fade
-        self.rotation = random.random() * 360
-        self.rotation_speed = random.random() * 10 - 5
         
     def update(self):
         self.x += self.vx
@@ -239,7 +915,6 @@ class Particle:
         self.vx *= 0.99
         self.vy *= 0.99
         self.lifetime -= 1
-        self.rotation += self.rotation_speed
         
         if self.fade:
             progress = self.lifetime / self.max_lifetime
@@ -248,116 +923,272 @@ class Particle:
         if self.lifetime <= 0:
             self.alive = False
             
-    def draw(self, surface):
+    def add_sprites(self, batch):
         if self.alive and self.size > 0.5:
             alpha = self.lifetime / self.max_lifetime if self.fade else 1
-            r = min(255, int(self.color[0] * alpha))
-            g = min(255, int(self.color[1] * alpha))
-            b = min(255, int(self.color[2] * alpha))
-            
-            if self.size > 2:
-                glow_r, glow_g, glow_b = r//3, g//3, b//3
-                pygame.draw.circle(surface, (glow_r, glow_g, glow_b), 
-                                 (int(self.x), int(self.y)), int(self.size * 2))
-            
-            pygame.draw.circle(surface, (r, g, b), (int(self.x), int(self.y)), max(1, int(self.size)))
-
+            glow_radius = int(self.size * 2) if self.size > 2 else 0
+            core_radius = max(1, int(self.size))
+            extent = max(glow_radius, core_radius)
+            sprite = glow_sprites.get(glow_sprites.particle_key(self.color, alpha, glow_radius, core_radius))
+            batch.append((sprite, (int(self.x) - extent, int(self.y) - extent), None, pygame.BLEND_ADD))
+
+
+class ParticlePool:
+    """Fixed set of Particle records reused for the whole process.
+
+    Live records stay packed in `live` and remember their slot, so recycling is
+    an O(1) swap with the last one. `when_full` is 'drop_oldest' or 'refuse'.
+    `spawn_order` lists (born, particle) in spawn order; entries whose record
+    died or was reused are skipped lazily, so the oldest live one is found in
+    amortized O(1).
+    """
+    def __init__(self, capacity=256, when_full='drop_oldest'):
+        if when_full not in ('drop_oldest', 'refuse'):
+            raise ValueError("when_full must be 'drop_oldest' or 'refuse'")
+        self.capacity = capacity
+        self.when_full = when_full
+        self.free = [Particle(0, 0, WHITE, velocity=(0, 0)) for _ in range(capacity)]
+        self.live = []
+        self.spawn_order = deque()
+        self.spawn_counter = 0
+        self.peak = 0
+        self.dropped = 0
+        self.refused = 0
+
+    def spawn(self, x, y, color, velocity, size=3, lifetime=30, gravity=0, fade=True):
+        if not self.free:
+            if self.when_full == 'refuse':
+                self.refused += 1
+                return None
+            self.drop_stale()
+            self.recycle(self.spawn_order.popleft()[1])
+            self.dropped += 1
+        particle = self.free.pop()
+        particle.reset(x, y, color, velocity, size, lifetime, gravity, fade)
+        self.spawn_counter += 1
+        particle.born = self.spawn_counter
+        particle.slot = len(self.live)
+        self.live.append(particle)
+        self.spawn_order.append((particle.born, particle))
+        self.drop_stale()
+        if len(self.live) > self.peak:
+            self.peak = len(self.live)
+        return particle
+
+    def drop_stale(self):
+        """Pop leading spawn_order entries for records that died or were reused since"""
+        order = self.spawn_order
+        while order and (order[0][1].slot == -1 or order[0][1].born != order[0][0]):
+            order.popleft()
+
+    def recycle(self, particle):
+        last = self.live.pop()
+        if last is not particle:
+            self.live[particle.slot] = last
+            last.slot = particle.slot
+        particle.slot = -1
+        self.free.append(particle)
+
+    def clear(self):
+        while self.live:
+            self.recycle(self.live[-1])
+        self.spawn_order.clear()
 
-class Spark(Particle):
-    def __init__(self, x, y, color, velocity=None):
-        super().__init__(x, y, color, velocity, size=2, lifetime=random.randint(10, 25))
-        self.trail = []
-        self.max_trail = 5
-        
     def update(self):
-        self.trail.append((self.x, self.y))
-        if len(self.trail) > self.max_trail:
-            self.trail.pop(0)
-        super().update()
-        
-    def draw(self, surface):
-        if self.alive:
-            for i, (tx, ty) in enumerate(self.trail):
-                alpha = (i + 1) / len(self.trail) * (self.lifetime / self.max_lifetime)
-                r = min(255, int(self.color[0] * alpha))
-                g = min(255, int(self.color[1] * alpha))
-                b = min(255, int(self.color[2] * alpha))
-                size = max(1, int(self.size * alpha))
-                pygame.draw.circle(surface, (r, g, b), (int(tx), int(ty)), size)
-            super().draw(surface)
+        # Walk backwards so the record swapped into a freed slot was already updated
+        live = self.live
+        for i in range(len(live) - 1, -1, -1):
+            particle = live[i]
+            particle.update()
+            if not particle.alive:
+                self.recycle(particle)
+
+    def add_sprites(self, batch):
+        for particle in self.live:
+            particle.add_sprites(batch)
+
+    def stats(self):
+        return {
+            'live': len(self.live),
+            'free': len(self.free),
+            'peak': self.peak,
+            'dropped': self.dropped,
+            'refused': self.refused,
+        }
+
+
+thruster_particles = ParticlePool(capacity=256)
+THRUSTER_COLORS = [CYAN, ELECTRIC_BLUE, WHITE, NEON_BLUE, (150, 220, 255)]
 
 
 class ThrusterFlame:
-    def __init__(self, ship_rect, facing_left=True):
+    def __init__(self, ship_rect, facing_left=True, pool=None):
         self.ship = ship_rect
         self.facing_left = facing_left
-        self.particles = []
-        self.time = 0
+        self.pool = pool if pool is not None else thruster_particles
+        self.spawn_debt = 0.0
         
-    def update(self, is_moving=True):
-        self.time += 1
-        
-        if self.time % 1 == 0:
-            count = 3 if is_moving else 1
-            for _ in range(count):
-                if self.facing_left:
-                    x = self.ship.x + self.ship.width + random.randint(0, 5)
-                    vx = random.random() * 3 + 2
+    def update(self, is_moving, dt):
+        """Emit exhaust into the shared pool at a fixed rate per second of elapsed time"""
+        self.spawn_debt += (THRUSTER_SPAWN_RATE if is_moving else THRUSTER_IDLE_SPAWN_RATE) * dt
+        count = int(self.spawn_debt)
+        self.spawn_debt -= count
+        count = particle_budget.request('thruster', count)
+        for _ in range(count):
+            if self.facing_left:
+                x = self.ship.x + self.ship.width + random.randint(0, 5)
+                vx = random.random() * 3 + 2
+            else:
+                x = self.ship.x - random.randint(0, 5)
+                vx = -(random.random() * 3 + 2)
+            
+            y = self.ship.y + self.ship.height // 2 + random.randint(-8, 8)
+            vy = random.random() * 1.5 - 0.75
+            
+            color = random.choice(THRUSTER_COLORS)
+            
+            self.pool.spawn(x, y, color, (vx, vy),
+                            size=random.randint(2, 5), lifetime=random.randint(8, 15))
+
+
+class TrailBuffer:
+    """Fixed-length ring buffers for every trail, packed into one contiguous array.
+
+    Each trail owns a row of `points`; pushing a point overwrites the oldest one
+    instead of shifting a list. Trails render as a glow polyline plus a gradient
+    drawn from a per-color ramp that is computed once.
+    """
+    def __init__(self, capacity=32, max_length=12):
+        self.max_length = max_length
+        self.points = np.zeros((capacity, max_length, 2), dtype=np.int32)
+        self.heads = np.zeros(capacity, dtype=np.int32)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.colors = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.ramps = {}
+
+    def _grow(self):
+        old_capacity = len(self.colors)
+        capacity = old_capacity * 2
+        for name in ('points', 'heads', 'counts'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self.colors.extend([None] * old_capacity)
+        self.free.extend(range(capacity - 1, old_capacity - 1, -1))
+
+    def add(self, color):
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.heads[slot] = 0
+        self.counts[slot] = 0
+        self.colors[slot] = color
+        return slot
+
+    def release(self, slot):
+        if self.colors[slot] is not None:
+            self.colors[slot] = None
+            self.free.append(slot)
+
+    def clear(self):
+        for slot, color in enumerate(self.colors):
+            if color is not None:
+                self.release(slot)
+
+    def push(self, slot, x, y):
+        head = self.heads[slot]
+        self.points[slot, head] = (x, y)
+        self.heads[slot] = (head + 1) % self.max_length
+        if self.counts[slot] < self.max_length:
+            self.counts[slot] += 1
+
+    def shrink(self, slot):
+        """Drop the oldest point; returns the points left"""
+        if self.counts[slot] > 0:
+            self.counts[slot] -= 1
+        return int(self.counts[slot])
+
+    def ordered_points(self, slot):
+        count = self.counts[slot]
+        index = (self.heads[slot] - count + np.arange(count)) % self.max_length
+        return self.points[slot, index].tolist()
+
+    def ramp(self, color, count):
+        """Gradient for a trail of `count` points, as (first, last, color, width) point ranges"""
+        key = (color, count)
+        bands = self.ramps.get(key)
+        if bands is None:
+            bands = []
+            for i in range(count - 1):
+                alpha = (i + 1) / count
+                width = int(4 * alpha) + 1
+                segment_color = (int(color[0] * alpha), int(color[1] * alpha), int(color[2] * alpha))
+                # Neighbouring segments share one draw call only if they look the same
+                if bands and bands[-1][2] == segment_color and bands[-1][3] == width:
+                    bands[-1][1] = i + 1
                 else:
-                    x = self.ship.x - random.randint(0, 5)
-                    vx = -(random.random() * 3 + 2)
-                
-                y = self.ship.y + self.ship.height // 2 + random.randint(-8, 8)
-                vy = random.random() * 1.5 - 0.75
-                
-                colors = [CYAN, ELECTRIC_BLUE, WHITE, NEON_BLUE, (150, 220, 255)]
-                color = random.choice(colors)
-                
-                particle = Particle(x, y, color, velocity=(vx, vy), 
-                                   size=random.randint(2, 5), lifetime=random.randint(8, 15))
-                self.particles.append(particle)
-        
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.alive:
-                self.particles.remove(particle)
-                
-    def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
-
+                    bands.append([i, i + 1, segment_color, width])
+            bands = self.ramps[key] = [tuple(band) for band in bands]
+        return bands
+
+    def draw(self, slot, surface):
+        count = int(self.counts[slot])
+        if count < 2:
+            return
+        color = self.colors[slot]
+        points = self.ordered_points(slot)
+        if count > 2:
+            glow_color = (color[0]//4, color[1]//4, color[2]//4)
+            dirty_rects.add(pygame.draw.lines(surface, glow_color, False, points, 6))
+        for first, last, band_color, width in self.ramp(color, count):
+            dirty_rects.add(pygame.draw.lines(surface, band_color, False, points[first:last + 1], width))
+
+
+trail_buffer = TrailBuffer()
+
+
+class BulletTrails:
+    """Trails keyed by bullet id.
+
+    add() and detach() are dict operations, so a bullet despawning doesn't
+    touch any other trail. With ORPHAN_TRAILS a detached trail keeps drawing
+    and loses its oldest point every tick until it is gone.
+    """
+    def __init__(self, orphans=ORPHAN_TRAILS):
+        self.keep_orphans = orphans
+        self.trails = {}
+        self.orphans = []
+        trail_buffer.clear()
+
+    def add(self, bullet, color):
+        self.trails[bullet.id] = trail_buffer.add(color)
+
+    def detach(self, bullet_id):
+        slot = self.trails.pop(bullet_id, None)
+        if slot is None:
+            return
+        if self.keep_orphans:
+            self.orphans.append(slot)
+        else:
+            trail_buffer.release(slot)
+
+    def update(self, *groups):
+        """Record this tick's bullet positions and age the orphaned trails"""
+        trails = self.trails
+        for bullet in itertools.chain(*groups):
+            trail_buffer.push(trails[bullet.id], bullet.x + bullet.width//2, bullet.y + bullet.height//2)
+        orphans = self.orphans
+        for index in range(len(orphans) - 1, -1, -1):
+            if trail_buffer.shrink(orphans[index]) < 2:
+                trail_buffer.release(orphans[index])
+                orphans[index] = orphans[-1]
+                orphans.pop()
 
-class BulletTrail:
-    def __init__(self, bullet, color):
-        self.bullet = bullet
-        self.color = color
-        self.trail_points = []
-        self.max_length = 12
-        
-    def update(self):
-        self.trail_points.append((self.bullet.x + self.bullet.width//2, 
-                                   self.bullet.y + self.bullet.height//2))
-        if len(self.trail_points) > self.max_length:
-            self.trail_points.pop(0)
-            
     def draw(self, surface):
-        if len(self.trail_points) > 1:
-            for i in range(len(self.trail_points) - 1):
-                alpha = (i + 1) / len(self.trail_points)
-                width = int(4 * alpha) + 1
-                r = int(self.color[0] * alpha)
-                g = int(self.color[1] * alpha)
-                b = int(self.color[2] * alpha)
-                pygame.draw.line(surface, (r, g, b), 
-                               self.trail_points[i], 
-                               self.trail_points[i + 1], width)
-            
-            if len(self.trail_points) > 2:
-                glow_color = (self.color[0]//4, self.color[1]//4, self.color[2]//4)
-                for i in range(len(self.trail_points) - 1):
-                    pygame.draw.line(surface, glow_color,
-                                   self.trail_points[i],
-                                   self.trail_points[i + 1], 6)
+        for slot in itertools.chain(self.trails.values(), self.orphans):
+            trail_buffer.draw(slot, surface)
 
 
 class EnergyRing:
@@ -375,116 +1206,284 @@ class EnergyRing:
         if self.radius > self.max_radius:
             self.alive = False
             
-    def draw(self, surface):
+    def add_sprites(self, batch, surface):
         if self.alive:
             alpha = 1 - (self.radius / self.max_radius)
-            r = int(self.color[0] * alpha)
-            g = int(self.color[1] * alpha)
-            b = int(self.color[2] * alpha)
+            color = (int(self.color[0] * alpha), int(self.color[1] * alpha), int(self.color[2] * alpha))
             width = max(1, int(3 * alpha))
-            pygame.draw.circle(surface, (r, g, b), (int(self.x), int(self.y)), 
-                             int(self.radius), width)
+            radius = int(self.radius)
+            if radius > glow_sprites.max_ring_radius:
+                dirty_rects.add(pygame.draw.circle(surface, color, (int(self.x), int(self.y)), radius, width))
+                return
+            sprite = glow_sprites.get(glow_sprites.ring_key(color, radius, width))
+            batch.append((sprite, (int(self.x) - radius, int(self.y) - radius), None, pygame.BLEND_ADD))
+
+
+class ParticleSystem:
+    """Struct-of-arrays particle store; every live particle is updated in one vectorized step"""
+    def __init__(self, capacity=2048, trail_length=5):
+        self.capacity = capacity
+        self.trail_length = trail_length
+        self.count = 0
+        self.frame = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.original_size = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.fade = np.zeros(capacity, dtype=bool)
+        self.spark = np.zeros(capacity, dtype=bool)
+        self.trail = np.zeros((capacity, self.trail_length, 2), dtype=np.float32)
+        self.trail_count = np.zeros(capacity, dtype=np.int32)
+
+    def _fields(self):
+        return (self.pos, self.vel, self.size, self.original_size, self.lifetime, self.max_lifetime,
+                self.gravity, self.color, self.fade, self.spark, self.trail, self.trail_count)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = self._fields()
+        self._allocate(capacity)
+        for new_arr, old_arr in zip(self._fields(), old):
+            new_arr[:self.count] = old_arr[:self.count]
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, color, vx, vy, size, lifetime, gravity=0.0, fade=True, spark=False):
+        """Append a batch of particles; every argument is a scalar or an array of the batch length"""
+        n = len(vx)
+        if n == 0:
+            return
+        start, end = self.count, self.count + n
+        if end > self.capacity:
+            self._grow(end)
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        self.vel[start:end, 0] = vx
+        self.vel[start:end, 1] = vy
+        self.size[start:end] = size
+        self.original_size[start:end] = size
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.gravity[start:end] = gravity
+        self.color[start:end] = color
+        self.fade[start:end] = fade
+        self.spark[start:end] = spark
+        self.trail_count[start:end] = 0
+        self.count = end
 
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        pos, vel = self.pos[:n], self.vel[:n]
+
+        # Sparks record their position before moving; all trails share one ring head
+        head = self.frame % self.trail_length
+        self.trail[:n, head] = pos
+        self.trail_count[:n] = np.minimum(self.trail_count[:n] + 1, self.trail_length)
+        self.frame += 1
+
+        pos += vel
+        vel[:, 1] += self.gravity[:n]
+        vel *= 0.99
+        self.lifetime[:n] -= 1
+
+        fade = self.fade[:n]
+        progress = self.lifetime[:n] / self.max_lifetime[:n]
+        self.size[:n] = np.where(fade, self.original_size[:n] * progress, self.size[:n])
+
+        alive = self.lifetime[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            for arr in self._fields():
+                arr[:len(keep)] = arr[keep]
+            self.count = len(keep)
+
+    def add_sprites(self, batch):
+        n = self.count
+        if n == 0:
+            return
+        progress = self.lifetime[:n] / self.max_lifetime[:n]
+        alpha = np.where(self.fade[:n], progress, 1.0)
+        size = self.size[:n]
+
+        for i in np.flatnonzero(self.spark[:n]).tolist():
+            self._add_trail_sprites(batch, i, progress[i])
+
+        visible = np.flatnonzero(size > 0.5)
+        if len(visible) == 0:
+            return
+        size = size[visible]
+        step = glow_sprites.color_step
+        color = (self.color[visible].astype(np.int32) // step * step).T.tolist()
+        alpha_level = np.rint(alpha[visible] * glow_sprites.alpha_levels).astype(np.int32).tolist()
+        glow_radius = np.where(size > 2, (size * 2).astype(np.int32), 0)
+        core_radius = np.maximum(1, size.astype(np.int32))
+        extent = np.maximum(glow_radius, core_radius)
+        dest = (self.pos[visible].astype(np.int32) - extent[:, None]).tolist()
+
+        get = glow_sprites.get
+        for key, xy in zip(zip(color[0], color[1], color[2], alpha_level,
+                               glow_radius.tolist(), core_radius.tolist()), dest):
+            batch.append((get(key), xy, None, pygame.BLEND_ADD))
+
+    def _add_trail_sprites(self, batch, i, life):
+        length = int(self.trail_count[i])
+        # Oldest point first, matching the list-based trail order
+        order = [(self.frame - length + k) % self.trail_length for k in range(length)]
+        color = self.color[i]
+        for k, slot in enumerate(order):
+            alpha = (k + 1) / length * life
+            radius = max(1, int(self.size[i] * alpha))
+            tx, ty = self.trail[i, slot]
+            sprite = glow_sprites.get(glow_sprites.particle_key(color, alpha, 0, radius))
+            batch.append((sprite, (int(tx) - radius, int(ty) - radius), None, pygame.BLEND_ADD))
+
+
+def update_effects():
+    """Advance rings and particles by one frame (one simulation tick during a match)"""
+    global energy_rings
+    for ring in energy_rings:
+        ring.update()
+    energy_rings = [ring for ring in energy_rings if ring.alive]
+    particles.update()
+    thruster_particles.update()
+
+
+def draw_effects(surface):
+    """Draw all rings and particles with a single blits() call"""
+    batch = []
+    for ring in energy_rings:
+        ring.add_sprites(batch, surface)
+    particles.add_sprites(batch)
+    thruster_particles.add_sprites(batch)
+    rects = surface.blits(batch, doreturn=dirty_rects.enabled)
+    if rects:
+        dirty_rects.add_all(rects)
 
-particles = []
+
+rng = np.random.default_rng()
+particles = ParticleSystem()
 energy_rings = []
-stars_layer1 = [Star(1) for _ in range(60)]
-stars_layer2 = [Star(2) for _ in range(35)]
-stars_layer3 = [Star(3) for _ in range(20)]
-all_stars = stars_layer1 + stars_layer2 + stars_layer3
-shooting_stars = [ShootingStar() for _ in range(3)]
+star_field = None
+
+
+def get_star_field():
+    """Create the stars on first use"""
+    global star_field
+    if star_field is None:
+        star_field = StarField([[Star(layer) for _ in range(count)]
+                                for layer, count in enumerate(STAR_LAYER_COUNTS, 1)])
+    return star_field
+
+
+@on_display_change
+def invalidate_star_field():
+    if star_field is not None:
+        star_field.invalidate()
+shooting_stars = [ShootingStar() for _ in range(MAX_SHOOTING_STARS)]
+on_display_change(ShootingStar.invalidate)
+particle_budget = ParticleBudget(
+    lambda: len(particles) + len(thruster_particles.live)
+    + sum(1 for ss in shooting_stars if ss.active))
 game_time = 0
 
 
-def create_explosion(x, y, color, count=25, speed_mult=1.0):
-    global particles, energy_rings
+def emit_radial(x, y, color, count, speed_min, speed_range, size, lifetime, gravity=0.0, spark=False):
+    """Emit `count` particles flying out from (x, y) in random directions"""
+    angle = rng.random(count) * math.pi * 2
+    speed = rng.random(count) * speed_range + speed_min
+    particles.emit(x, y, color, np.cos(angle) * speed, np.sin(angle) * speed,
+                   size, lifetime, gravity=gravity, spark=spark)
+
+
+def emit_sparks(x, y, color, vx, vy):
+    particles.emit(x, y, color, vx, vy, 2, rng.integers(10, 26, len(vx)), spark=True)
+
+
+def create_explosion(x, y, color, count=25, speed_mult=1.0, emitter='explosion'):
+    global energy_rings
     
     energy_rings.append(EnergyRing(x, y, color, max_radius=80, speed=4))
     energy_rings.append(EnergyRing(x, y, WHITE, max_radius=50, speed=6))
     
-    for _ in range(count):
-        angle = random.random() * math.pi * 2
-        speed = (random.random() * 5 + 2) * speed_mult
-        vx = math.cos(angle) * speed
-        vy = math.sin(angle) * speed
-        size = random.randint(2, 6)
-        lifetime = random.randint(25, 50)
-        
-        variation = random.randint(-40, 40)
-        varied_color = (
-            max(0, min(255, color[0] + variation)),
-            max(0, min(255, color[1] + variation)),
-            max(0, min(255, color[2] + variation))
-        )
-        
-        particles.append(Particle(x, y, varied_color, velocity=(vx, vy), 
-                                  size=size, lifetime=lifetime, gravity=0.08))
+    count = particle_budget.request(emitter, count)
+    variation = rng.integers(-40, 41, (count, 1))
+    varied_colors = np.clip(np.array(color) + variation, 0, 255)
+    emit_radial(x, y, varied_colors, count, 2 * speed_mult, 5 * speed_mult,
+                rng.integers(2, 7, count), rng.integers(25, 51, count), gravity=0.08)
     
-    for _ in range(10):
-        angle = random.random() * math.pi * 2
-        speed = random.random() * 8 + 3
-        vx = math.cos(angle) * speed
-        vy = math.sin(angle) * speed
-        particles.append(Spark(x, y, WHITE, velocity=(vx, vy)))
+    sparks = particle_budget.request(emitter, 10)
+    angle = rng.random(sparks) * math.pi * 2
+    speed = rng.random(sparks) * 8 + 3
+    emit_sparks(x, y, WHITE, np.cos(angle) * speed, np.sin(angle) * speed)
 
 
 def create_hit_effect(x, y, color):
-    global particles, screen_shake_amount, energy_rings
+    global screen_shake_amount, energy_rings
     screen_shake_amount = 12
     
     energy_rings.append(EnergyRing(x, y, color, max_radius=60, speed=5))
     
-    create_explosion(x, y, color, count=20, speed_mult=0.9)
+    create_explosion(x, y, color, count=20, speed_mult=0.9, emitter='hit')
     
-    for _ in range(8):
-        angle = random.random() * math.pi * 2
-        speed = random.random() * 6 + 2
-        particles.append(Spark(x, y, WHITE, velocity=(math.cos(angle)*speed, math.sin(angle)*speed)))
+    sparks = particle_budget.request('hit', 8)
+    angle = rng.random(sparks) * math.pi * 2
+    speed = rng.random(sparks) * 6 + 2
+    emit_sparks(x, y, WHITE, np.cos(angle) * speed, np.sin(angle) * speed)
 
 
 def create_muzzle_flash(x, y, facing_left):
-    global particles
     base_vx = 5 if not facing_left else -5
     
-    for _ in range(12):
-        vx = base_vx + random.random() * 4 - 2
-        vy = random.random() * 3 - 1.5
-        color = random.choice([WHITE, YELLOW, ORANGE, BRIGHT_YELLOW])
-        particles.append(Particle(x, y, color, velocity=(vx, vy), size=random.randint(2, 4), lifetime=10))
+    count = particle_budget.request('muzzle', 12)
+    palette = np.array([WHITE, YELLOW, ORANGE, BRIGHT_YELLOW])
+    particles.emit(x, y, palette[rng.integers(0, 4, count)],
+                   base_vx + rng.random(count) * 4 - 2, rng.random(count) * 3 - 1.5,
+                   rng.integers(2, 5, count), 10)
     
-    for _ in range(5):
-        particles.append(Spark(x, y, WHITE, velocity=(base_vx * 1.5 + random.random()*2-1, random.random()*2-1)))
+    sparks = particle_budget.request('muzzle', 5)
+    emit_sparks(x, y, WHITE, base_vx * 1.5 + rng.random(sparks) * 2 - 1, rng.random(sparks) * 2 - 1)
 
 
 def create_victory_explosion(x, y, color):
-    global particles, energy_rings
+    global energy_rings
     
     for i in range(5):
         delay_radius = 30 + i * 40
         energy_rings.append(EnergyRing(x, y, color, max_radius=delay_radius + 60, speed=3 + i))
     
-    for ring in range(4):
-        for i in range(25):
-            angle = (i / 25) * math.pi * 2 + ring * 0.3
-            speed = 4 + ring * 2.5
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            ring_color = [color, CYAN, MAGENTA, WHITE][ring % 4]
-            particles.append(Particle(x, y, ring_color, velocity=(vx, vy), 
-                                      size=5, lifetime=60 + ring * 15))
-    
-    for _ in range(50):
-        angle = random.random() * math.pi * 2
-        speed = random.random() * 10 + 3
-        vx = math.cos(angle) * speed
-        vy = math.sin(angle) * speed
-        sparkle_color = random.choice([WHITE, CYAN, MAGENTA, YELLOW, color, NEON_PINK])
-        particles.append(Particle(x, y, sparkle_color, velocity=(vx, vy), 
-                                  size=random.randint(2, 7), lifetime=random.randint(50, 100)))
-    
-    for _ in range(20):
-        particles.append(Spark(x, y, random.choice([WHITE, color]), 
-                              velocity=(random.random()*16-8, random.random()*16-8)))
+    count = particle_budget.request('victory', 100)
+    ring = np.repeat(np.arange(4), 25)[:count]
+    angle = (np.tile(np.arange(25), 4)[:count] / 25) * math.pi * 2 + ring * 0.3
+    speed = 4 + ring * 2.5
+    ring_colors = np.array([color, CYAN, MAGENTA, WHITE])[ring]
+    particles.emit(x, y, ring_colors, np.cos(angle) * speed, np.sin(angle) * speed,
+                   5, 60 + ring * 15)
+    
+    count = particle_budget.request('victory', 50)
+    sparkle_palette = np.array([WHITE, CYAN, MAGENTA, YELLOW, color, NEON_PINK])
+    emit_radial(x, y, sparkle_palette[rng.integers(0, 6, count)], count, 3, 10,
+                rng.integers(2, 8, count), rng.integers(50, 101, count))
+    
+    sparks = particle_budget.request('victory', 20)
+    spark_palette = np.array([WHITE, color])
+    emit_sparks(x, y, spark_palette[rng.integers(0, 2, sparks)],
+                rng.random(sparks) * 16 - 8, rng.random(sparks) * 16 - 8)
 
 
 def draw_glow_rect(surface, color, rect, glow_size=5):
@@ -495,6 +1494,8 @@ def draw_glow_rect(surface, color, rect, glow_size=5):
         glow_b = int(color[2] * alpha)
         glow_rect = rect.inflate(i*3, i*3)
         pygame.draw.rect(surface, (glow_r, glow_g, glow_b), glow_rect, border_radius=3)
+        if i == glow_size:
+            dirty_rects.add(glow_rect)
     
     pygame.draw.rect(surface, color, rect, border_radius=2)
     
@@ -502,19 +1503,84 @@ def draw_glow_rect(surface, color, rect, glow_size=5):
     pygame.draw.line(surface, highlight, (rect.x+2, rect.y+1), (rect.x+rect.width-2, rect.y+1))
 
 
-def draw_neon_text(surface, text, font, x, y, color, glow_intensity=3):
-    for offset in range(glow_intensity, 0, -1):
-        glow_alpha = 0.4 / offset
-        glow_r = int(color[0] * glow_alpha)
-        glow_g = int(color[1] * glow_alpha)
-        glow_b = int(color[2] * glow_alpha)
-        glow_text = font.render(text, True, (glow_r, glow_g, glow_b))
-        for dx, dy in [(-offset, 0), (offset, 0), (0, -offset), (0, offset),
-                       (-offset, -offset), (offset, offset), (-offset, offset), (offset, -offset)]:
-            surface.blit(glow_text, (x + dx, y + dy))
-    
-    main_text = font.render(text, True, color)
-    surface.blit(main_text, (x, y))
+def premultiplied(surface):
+    """Copy of a per-pixel-alpha surface with its colors multiplied by alpha.
+
+    Done with surfarray because Surface.premul_alpha() mangles the transparent
+    pixels of antialiased font renders.
+    """
+    surface = surface.copy()
+    rgb = pygame.surfarray.pixels3d(surface)
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    rgb[...] = (rgb.astype(np.uint16) * alpha[..., None] + 127) // 255
+    del rgb, alpha
+    return surface
+
+
+class NeonTextCache:
+    """LRU cache of finished neon-text composites: every glow copy and the main text in one surface.
+
+    Composites are premultiplied and blitted with BLEND_PREMULTIPLIED, which gives
+    the same result as stacking the individual glow blits on the target.
+    """
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text, font, color, glow_intensity):
+        key = (text, font, color, glow_intensity)
+        composite = self.entries.get(key)
+        if composite is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return composite
+        self.misses += 1
+        composite = self.render(text, font, color, glow_intensity)
+        self.entries[key] = composite
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return composite
+
+    def render(self, text, font, color, glow_intensity):
+        width, height = font.size(text)
+        pad = glow_intensity
+        composite = pygame.Surface((width + pad * 2, height + pad * 2), pygame.SRCALPHA)
+        for offset in range(glow_intensity, 0, -1):
+            glow_alpha = 0.4 / offset
+            glow_r = int(color[0] * glow_alpha)
+            glow_g = int(color[1] * glow_alpha)
+            glow_b = int(color[2] * glow_alpha)
+            glow_text = premultiplied(font.render(text, True, (glow_r, glow_g, glow_b)))
+            for dx, dy in [(-offset, 0), (offset, 0), (0, -offset), (0, offset),
+                           (-offset, -offset), (offset, offset), (-offset, offset), (offset, -offset)]:
+                composite.blit(glow_text, (pad + dx, pad + dy), special_flags=pygame.BLEND_PREMULTIPLIED)
+        
+        main_text = premultiplied(font.render(text, True, color))
+        composite.blit(main_text, (pad, pad), special_flags=pygame.BLEND_PREMULTIPLIED)
+        return composite
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+neon_text_cache = NeonTextCache()
+
+
+def draw_neon_text(surface, text, font, x, y, color, glow_intensity=3, color_step=1):
+    """Draw glowing text with one blit; pulsing callers pass a color_step so nearby shades share a composite"""
+    if color_step > 1:
+        color = tuple(min(255, round(c / color_step) * color_step) for c in color)
+    composite = neon_text_cache.get(text, font, color, glow_intensity)
+    dirty_rects.add(surface.blit(composite, (x - glow_intensity, y - glow_intensity),
+                                 special_flags=pygame.BLEND_PREMULTIPLIED))
 
 
 def draw_health_bar(surface, x, y, health, max_health, width, height, color):
@@ -559,20 +1625,139 @@ def draw_ammo_display(surface, x, y, current_ammo, max_ammo, color):
             pygame.draw.rect(surface, (50, 50, 60), (bullet_x, y, 12, 8), 1, border_radius=2)
 
 
-def draw_animated_background(surface, time):
-    surface.fill((5, 5, 15))
-    
-    surface.blit(SPACE, (0, 0), special_flags=pygame.BLEND_ADD)
-    
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 30, 60))
-    surface.blit(overlay, (0, 0))
-    
-    for star in all_stars:
-        star.update()
-        star.draw(surface, time)
-    
-    if random.random() < 0.01:
+class HudWidget:
+    """One HUD element cached on its own surface and redrawn only when its value changes.
+
+    With `animated` set, the shown value eases toward a new value by `rate` per
+    simulation tick (see HudLayer.advance), redrawing on each step of the transition.
+    """
+    def __init__(self, pos, size, pad, render, animated=False, rate=0.2):
+        self.pos = (pos[0] - pad, pos[1] - pad)
+        self.size = (size[0] + pad * 2, size[1] + pad * 2)
+        self.pad = pad
+        self.render = render
+        self.animated = animated
+        self.rate = rate
+        self.surface = None
+        # Value drawn on the surface, value being shown (eased toward target), value to show
+        self.value = None
+        self.shown = None
+        self.target = None
+
+    def set_target(self, value):
+        self.target = value
+        if not self.animated or self.shown is None:
+            self.shown = value
+
+    def advance(self):
+        """Step the transition toward the target by one tick"""
+        if self.shown != self.target:
+            if abs(self.target - self.shown) <= self.rate:
+                self.shown = self.target
+            else:
+                self.shown += self.rate if self.target > self.shown else -self.rate
+
+    def update(self, value):
+        """Bring the cached surface up to date; returns True when it had to be redrawn"""
+        self.set_target(value)
+        if self.surface is not None and self.shown == self.value:
+            return False
+        if self.surface is None:
+            self.surface = to_display_format(pygame.Surface(self.size, pygame.SRCALPHA), alpha=True)
+        self.surface.fill((0, 0, 0, 0))
+        self.render(self.surface, self.pad, self.pad, self.shown)
+        self.value = self.shown
+        return True
+
+
+class HudLayer:
+    def __init__(self):
+        self.widgets = {}
+        self.rebuilds = 0
+
+    def add(self, name, widget):
+        self.widgets[name] = widget
+
+    def draw(self, surface, **values):
+        for name, value in values.items():
+            widget = self.widgets[name]
+            if widget.update(value):
+                self.rebuilds += 1
+                dirty_rects.add(pygame.Rect(widget.pos, widget.size))
+            surface.blit(widget.surface, widget.pos)
+
+    def advance(self, **values):
+        """Once per simulation tick, so animated transitions run at the same speed at any frame rate"""
+        for name, value in values.items():
+            widget = self.widgets[name]
+            widget.set_target(value)
+            widget.advance()
+
+    def invalidate(self):
+        for widget in self.widgets.values():
+            widget.surface = None
+            widget.value = None
+
+    def reset(self):
+        """Start a new match: force a redraw, drop running transitions and restart the rebuild counter"""
+        self.invalidate()
+        for widget in self.widgets.values():
+            widget.shown = None
+        self.rebuilds = 0
+
+
+hud = HudLayer()
+hud.add('yellow_health', HudWidget(
+    (15, 15), (160, 22), 6,
+    lambda surface, x, y, health: draw_health_bar(surface, x, y, health, 10, 160, 22, YELLOW),
+    animated=HUD_ANIMATED_TRANSITIONS))
+hud.add('red_health', HudWidget(
+    (WIDTH - 175, 15), (160, 22), 6,
+    lambda surface, x, y, health: draw_health_bar(surface, x, y, health, 10, 160, 22, RED),
+    animated=HUD_ANIMATED_TRANSITIONS))
+hud.add('yellow_ammo', HudWidget(
+    (15, 65), ((MAX_BULLETS - 1) * 18 + 12, 8), 3,
+    lambda surface, x, y, ammo: draw_ammo_display(surface, x, y, ammo, MAX_BULLETS, YELLOW)))
+hud.add('red_ammo', HudWidget(
+    (WIDTH - 69, 65), ((MAX_BULLETS - 1) * 18 + 12, 8), 3,
+    lambda surface, x, y, ammo: draw_ammo_display(surface, x, y, ammo, MAX_BULLETS, RED)))
+on_display_change(hud.invalidate)
+
+
+static_background = None
+static_background_has_space = False
+
+
+@on_display_change
+def invalidate_static_background():
+    global static_background
+    static_background = None
+
+
+def get_static_background():
+    """Tinted space backdrop, composited once in the display pixel format.
+
+    Until space.jpg has finished loading in the background the plain tint is
+    shown, and the backdrop is rebuilt once the image is ready.
+    """
+    global static_background, static_background_has_space
+    if static_background is None or (not static_background_has_space and assets.ready('space')):
+        static_background_has_space = assets.ready('space')
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill((5, 5, 15))
+        if static_background_has_space:
+            background.blit(assets.get('space'), (0, 0), special_flags=pygame.BLEND_ADD)
+        dirty_rects.invalidate_all()
+        
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 30, 60))
+        background.blit(overlay, (0, 0))
+        static_background = to_display_format(background)
+    return static_background
+
+
+def update_shooting_stars(chance=SHOOTING_STAR_CHANCE):
+    if random.random() < chance:
         for ss in shooting_stars:
             if not ss.active:
                 ss.spawn()
@@ -580,82 +1765,174 @@ def draw_animated_background(surface, time):
     
     for ss in shooting_stars:
         ss.update()
+
+
+def draw_animated_background(surface, time, shooting_star_chance=SHOOTING_STAR_CHANCE):
+    """Backdrop, stars and shooting stars; pass shooting_star_chance=None if they are advanced elsewhere"""
+    surface.blit(get_static_background(), (0, 0))
+    
+    get_star_field().draw(surface, time)
+    
+    if shooting_star_chance is not None:
+        update_shooting_stars(shooting_star_chance)
+    
+    for ss in shooting_stars:
         ss.draw(surface)
 
 
+class NeonBorder:
+    """Centre-line neon border built from pre-rendered textures.
+
+    The glow falloff and a wave gradient one period taller than the screen are
+    rendered once at full brightness. Each frame copies the glow and the wave
+    rows at the current phase, then scales both by the pulse with a multiply fill.
+    """
+    GLOW = 12
+    WAVE_PERIOD = 2 * math.pi / 0.05
+    WAVE_ROWS = math.ceil(WAVE_PERIOD)
+
+    def __init__(self):
+        self.glow = None
+        self.wave = None
+        self.strip = None
+        self.gradient_rect = pygame.Rect(self.GLOW, 0, BORDER.width, HEIGHT)
+
+    def build(self):
+        width = BORDER.width + self.GLOW * 2
+        self.glow = pygame.Surface((width, HEIGHT))
+        for i in range(self.GLOW, 0, -2):
+            glow_intensity = 1 / (i * 0.5)
+            glow_color = (0, int(180 * glow_intensity), int(255 * glow_intensity))
+            self.glow.fill(glow_color, pygame.Rect(self.GLOW - i, 0, BORDER.width + i * 2, HEIGHT))
+        
+        self.wave = pygame.Surface((BORDER.width, self.WAVE_ROWS + HEIGHT))
+        for y in range(self.WAVE_ROWS + HEIGHT):
+            level = round(255 * (math.sin(y * 0.05) * 0.3 + 0.7))
+            self.wave.fill((0, level, level), (0, y, BORDER.width, 1))
+        
+        self.glow = to_display_format(self.glow)
+        self.wave = to_display_format(self.wave)
+        self.strip = to_display_format(pygame.Surface((width, HEIGHT)))
+
+    def invalidate(self):
+        self.glow = self.wave = self.strip = None
+
+    def draw(self, surface, time):
+        if self.strip is None:
+            self.build()
+        pulse = math.sin(time * 0.08) * 0.4 + 0.6
+        wave_offset = time * 3
+        strip = self.strip
+        
+        strip.blit(self.glow, (0, 0))
+        glow_level = int(255 * pulse)
+        strip.fill((0, glow_level, glow_level), special_flags=pygame.BLEND_MULT)
+        
+        phase_row = round(wave_offset % self.WAVE_PERIOD) % self.WAVE_ROWS
+        strip.blit(self.wave, self.gradient_rect.topleft, (0, phase_row, BORDER.width, HEIGHT))
+        wave_level = round(200 * pulse)
+        strip.fill((0, wave_level, wave_level), self.gradient_rect, pygame.BLEND_MULT)
+        strip.fill((0, 0, 50), self.gradient_rect, pygame.BLEND_ADD)
+        pygame.draw.rect(strip, WHITE, self.gradient_rect, 1)
+        
+        dirty_rects.add(surface.blit(strip, (BORDER.x - self.GLOW, 0)))
+        
+        for y in range(0, HEIGHT, 30):
+            spark_y = (y + int(wave_offset * 2)) % HEIGHT
+            spark_brightness = int((math.sin(spark_y * 0.1 + time * 0.1) + 1) * 127)
+            if spark_brightness > 200:
+                pygame.draw.circle(surface, WHITE, (BORDER.centerx, spark_y), 2)
+
+
+neon_border = NeonBorder()
+on_display_change(neon_border.invalidate)
+
+
 def draw_neon_border(surface, time):
-    pulse = math.sin(time * 0.08) * 0.4 + 0.6
-    wave_offset = time * 3
-    
-    for i in range(12, 0, -2):
-        glow_intensity = pulse / (i * 0.5)
-        glow_color = (0, int(180 * glow_intensity), int(255 * glow_intensity))
-        glow_rect = BORDER.inflate(i*2, 0)
-        pygame.draw.rect(surface, glow_color, glow_rect)
+    neon_border.draw(surface, time)
+
+
+CONTROL_BOX_1 = pygame.Rect(WIDTH//2 - 190, 160, 380, 130)
+CONTROL_BOX_2 = pygame.Rect(WIDTH//2 - 190, 310, 380, 130)
+START_BOX = pygame.Rect(WIDTH//2 - 200, 260, 400, 110)
+
+
+menu_layers = {}
+on_display_change(menu_layers.clear)
+
+
+@functools.lru_cache(maxsize=64)
+def render_text(font, text, color):
+    return font.render(text, True, color)
+
+
+def get_menu_layer(key, rect, render):
+    """Static part of a menu screen, drawn once by `render` and cropped to `rect`"""
+    layer = menu_layers.get(key)
+    if layer is None:
+        canvas = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        render(canvas)
+        layer = to_display_format(canvas.subsurface(rect).copy(), alpha=True)
+        menu_layers[key] = layer
+    return layer
+
+
+def render_control_scheme_layer(surface):
+    for box, fill, outline, title, lines in (
+            (CONTROL_BOX_1, (15, 30, 50), NEON_BLUE, "Press 1: Arrow Keys",
+             ("Move: Arrow Keys", "Shoot: Right Ctrl")),
+            (CONTROL_BOX_2, (40, 15, 50), NEON_PINK, "Press 2: Mouse Control",
+             ("Move: Mouse Position", "Shoot: Left Click"))):
+        pygame.draw.rect(surface, fill, box, border_radius=12)
+        pygame.draw.rect(surface, outline, box, 2, border_radius=12)
+        
+        draw_neon_text(surface, title, get_font('menu'), box.x + 30, box.y + 20, outline)
+        surface.blit(get_font('instruction').render(lines[0], True, WHITE), (box.x + 30, box.y + 60))
+        surface.blit(get_font('instruction').render(lines[1], True, WHITE), (box.x + 30, box.y + 90))
+
+
+def render_start_layer(surface, control_scheme):
+    pygame.draw.rect(surface, (20, 20, 35), START_BOX, border_radius=12)
+    pygame.draw.rect(surface, (60, 60, 90), START_BOX, 2, border_radius=12)
     
-    gradient_surface = pygame.Surface((BORDER.width, HEIGHT), pygame.SRCALPHA)
-    for y in range(HEIGHT):
-        wave = math.sin((y + wave_offset) * 0.05) * 0.3 + 0.7
-        brightness = int(200 * wave * pulse)
-        color = (0, brightness, min(255, brightness + 50))
-        pygame.draw.line(gradient_surface, color, (0, y), (BORDER.width, y))
-    surface.blit(gradient_surface, (BORDER.x, 0))
+    yellow_text = get_font('instruction').render("Yellow: WASD + Left Ctrl", True, YELLOW)
+    surface.blit(yellow_text, (WIDTH//2 - yellow_text.get_width()//2, START_BOX.y + 20))
     
-    pygame.draw.rect(surface, WHITE, BORDER, 1)
+    if control_scheme == 1:
+        red_text = get_font('instruction').render("Red: Arrows + Right Ctrl", True, RED)
+    else:
+        red_text = get_font('instruction').render("Red: Mouse + Left Click", True, RED)
+    surface.blit(red_text, (WIDTH//2 - red_text.get_width()//2, START_BOX.y + 55))
     
-    for y in range(0, HEIGHT, 30):
-        spark_y = (y + int(wave_offset * 2)) % HEIGHT
-        spark_brightness = int((math.sin(spark_y * 0.1 + time * 0.1) + 1) * 127)
-        if spark_brightness > 200:
-            pygame.draw.circle(surface, WHITE, (BORDER.centerx, spark_y), 2)
+    change_text = get_font('small').render("Press C to change controls", True, (120, 120, 140))
+    surface.blit(change_text, (WIDTH//2 - change_text.get_width()//2, 390))
 
 
 def draw_control_scheme_screen():
     global game_time
     game_time += 1
+    dirty_rects.begin('controls')
     
     game_surface = render_game_surface()
     draw_animated_background(game_surface, game_time)
     
     title_y = 50 + math.sin(game_time * 0.04) * 8
-    draw_neon_text(game_surface, "SELECT CONTROLS", TITLE_FONT, 
-                   WIDTH//2 - TITLE_FONT.size("SELECT CONTROLS")[0]//2, 
+    draw_neon_text(game_surface, "SELECT CONTROLS", get_font('title'), 
+                   WIDTH//2 - get_font('title').size("SELECT CONTROLS")[0]//2, 
                    int(title_y), CYAN, glow_intensity=4)
     
-    box_width, box_height = 380, 130
-    box1_x = WIDTH//2 - box_width//2
-    box1_y = 160
-    
     box1_pulse = math.sin(game_time * 0.1) * 0.2 + 0.8
-    for i in range(5, 0, -1):
-        glow_color = (0, int(60 * box1_pulse / i), int(100 * box1_pulse / i))
-        pygame.draw.rect(game_surface, glow_color, 
-                        (box1_x - i*2, box1_y - i*2, box_width + i*4, box_height + i*4), 
-                        border_radius=15)
-    
-    pygame.draw.rect(game_surface, (15, 30, 50), (box1_x, box1_y, box_width, box_height), border_radius=12)
-    pygame.draw.rect(game_surface, NEON_BLUE, (box1_x, box1_y, box_width, box_height), 2, border_radius=12)
-    
-    draw_neon_text(game_surface, "Press 1: Arrow Keys", MENU_FONT,
-                   box1_x + 30, box1_y + 20, NEON_BLUE)
-    game_surface.blit(INSTRUCTION_FONT.render("Move: Arrow Keys", True, WHITE), (box1_x + 30, box1_y + 60))
-    game_surface.blit(INSTRUCTION_FONT.render("Shoot: Right Ctrl", True, WHITE), (box1_x + 30, box1_y + 90))
-    
-    box2_y = 310
     box2_pulse = math.sin(game_time * 0.1 + 1) * 0.2 + 0.8
+    dirty_rects.add(CONTROL_BOX_1.inflate(20, 20))
+    dirty_rects.add(CONTROL_BOX_2.inflate(20, 20))
     for i in range(5, 0, -1):
+        glow_color = (0, int(60 * box1_pulse / i), int(100 * box1_pulse / i))
+        pygame.draw.rect(game_surface, glow_color, CONTROL_BOX_1.inflate(i*4, i*4), border_radius=15)
         glow_color = (int(80 * box2_pulse / i), 0, int(60 * box2_pulse / i))
-        pygame.draw.rect(game_surface, glow_color, 
-                        (box1_x - i*2, box2_y - i*2, box_width + i*4, box_height + i*4), 
-                        border_radius=15)
+        pygame.draw.rect(game_surface, glow_color, CONTROL_BOX_2.inflate(i*4, i*4), border_radius=15)
     
-    pygame.draw.rect(game_surface, (40, 15, 50), (box1_x, box2_y, box_width, box_height), border_radius=12)
-    pygame.draw.rect(game_surface, NEON_PINK, (box1_x, box2_y, box_width, box_height), 2, border_radius=12)
-    
-    draw_neon_text(game_surface, "Press 2: Mouse Control", MENU_FONT,
-                   box1_x + 30, box2_y + 20, NEON_PINK)
-    game_surface.blit(INSTRUCTION_FONT.render("Move: Mouse Position", True, WHITE), (box1_x + 30, box2_y + 60))
-    game_surface.blit(INSTRUCTION_FONT.render("Shoot: Left Click", True, WHITE), (box1_x + 30, box2_y + 90))
+    layer_rect = CONTROL_BOX_1.union(CONTROL_BOX_2)
+    game_surface.blit(get_menu_layer('controls', layer_rect, render_control_scheme_layer), layer_rect)
     
     display_surface(game_surface)
 
@@ -663,14 +1940,16 @@ def draw_control_scheme_screen():
 def draw_start_screen(control_scheme):
     global game_time
     game_time += 1
+    dirty_rects.begin('start')
     
     game_surface = render_game_surface()
-    draw_animated_background(game_surface, game_time)
+    # Attract mode: a meteor shower behind the title
+    draw_animated_background(game_surface, game_time, METEOR_SHOWER_CHANCE)
     
     title_y = 60 + math.sin(game_time * 0.04) * 10
     
-    draw_neon_text(game_surface, "SPACE BATTLE", HUGE_FONT,
-                   WIDTH//2 - HUGE_FONT.size("SPACE BATTLE")[0]//2,
+    draw_neon_text(game_surface, "SPACE BATTLE", get_font('huge'),
+                   WIDTH//2 - get_font('huge').size("SPACE BATTLE")[0]//2,
                    int(title_y), CYAN, glow_intensity=5)
     
     subtitle_pulse = (math.sin(game_time * 0.1) + 1) / 2
@@ -679,29 +1958,20 @@ def draw_start_screen(control_scheme):
         int(50 * subtitle_pulse + 100 * (1 - subtitle_pulse)),
         int(255 * (1 - subtitle_pulse) + 200 * subtitle_pulse)
     )
-    draw_neon_text(game_surface, "NEON EDITION", MENU_FONT,
-                   WIDTH//2 - MENU_FONT.size("NEON EDITION")[0]//2,
-                   int(title_y) + 90, subtitle_color)
-    
-    blink = int((math.sin(game_time * 0.12) + 1) * 60) + 135
-    restart_text = INSTRUCTION_FONT.render("R - Restart  |  C - Controls  |  F11 - Fullscreen  |  ESC - Quit", True, (blink, blink, blink))
-    game_surface.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50))
+    draw_neon_text(game_surface, "NEON EDITION", get_font('menu'),
+                   WIDTH//2 - get_font('menu').size("NEON EDITION")[0]//2,
+                   int(title_y) + 90, subtitle_color, color_step=PULSE_COLOR_STEP)
     
-    box_x, box_y = WIDTH//2 - 200, 260
-    pygame.draw.rect(game_surface, (20, 20, 35), (box_x, box_y, 400, 110), border_radius=12)
-    pygame.draw.rect(game_surface, (60, 60, 90), (box_x, box_y, 400, 110), 2, border_radius=12)
-    
-    yellow_text = INSTRUCTION_FONT.render("Yellow: WASD + Left Ctrl", True, YELLOW)
-    game_surface.blit(yellow_text, (WIDTH//2 - yellow_text.get_width()//2, box_y + 20))
-    
-    if control_scheme == 1:
-        red_text = INSTRUCTION_FONT.render("Red: Arrows + Right Ctrl", True, RED)
-    else:
-        red_text = INSTRUCTION_FONT.render("Red: Mouse + Left Click", True, RED)
-    game_surface.blit(red_text, (WIDTH//2 - red_text.get_width()//2, box_y + 55))
+    blink = (int((math.sin(game_time * 0.12) + 1) * 60) + 135) // PULSE_COLOR_STEP * PULSE_COLOR_STEP
+    restart_text = render_text(get_font('instruction'), "R - Restart  |  C - Controls  |  F11 - Fullscreen  |  ESC - Quit",
+                               (blink, blink, blink))
+    dirty_rects.add(game_surface.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50)))
     
-    change_text = SMALL_FONT.render("Press C to change controls", True, (120, 120, 140))
-    game_surface.blit(change_text, (WIDTH//2 - change_text.get_width()//2, 390))
+    change_width, change_height = get_font('small').size("Press C to change controls")
+    layer_rect = START_BOX.union((WIDTH//2 - change_width//2, 390, change_width, change_height))
+    layer = get_menu_layer(('start', control_scheme), layer_rect,
+                           lambda surface: render_start_layer(surface, control_scheme))
+    game_surface.blit(layer, layer_rect)
     
     ship_float_y = math.sin(game_time * 0.06) * 15
     ship_float_r = math.sin(game_time * 0.06 + math.pi) * 15
@@ -709,122 +1979,104 @@ def draw_start_screen(control_scheme):
     ship_bob_y = math.sin(game_time * 0.15) * 3
     ship_bob_r = math.sin(game_time * 0.15 + 0.5) * 3
     
-    game_surface.blit(YELLOW_SPACESHIP, (80, 180 + ship_float_y + ship_bob_y))
-    game_surface.blit(RED_SPACESHIP, (WIDTH - 130, 180 + ship_float_r + ship_bob_r))
+    dirty_rects.add(game_surface.blit(assets.get('yellow_ship'), (80, 180 + ship_float_y + ship_bob_y)))
+    dirty_rects.add(game_surface.blit(assets.get('red_ship'), (WIDTH - 130, 180 + ship_float_r + ship_bob_r)))
     
     for i in range(3):
         spark_x = 135 + random.randint(-2, 2)
         spark_y = 200 + ship_float_y + random.randint(-5, 5)
-        pygame.draw.circle(game_surface, CYAN, (spark_x, int(spark_y)), random.randint(1, 3))
+        dirty_rects.add(pygame.draw.circle(game_surface, CYAN, (spark_x, int(spark_y)), random.randint(1, 3)))
     
     for i in range(3):
         spark_x = WIDTH - 135 + random.randint(-2, 2)
         spark_y = 200 + ship_float_r + random.randint(-5, 5)
-        pygame.draw.circle(game_surface, ORANGE, (spark_x, int(spark_y)), random.randint(1, 3))
+        dirty_rects.add(pygame.draw.circle(game_surface, ORANGE, (spark_x, int(spark_y)), random.randint(1, 3)))
     
     display_surface(game_surface)
 
 
+def position_key(item):
+    """Bullets are keyed by bullet id (Bullet objects are reused), ships by the ship itself"""
+    return item.id if isinstance(item, engine.Bullet) else item
+
+
+def snapshot_positions(*groups):
+    """Positions of the ships/bullets in `groups` before a tick"""
+    return {position_key(item): (item.x, item.y) for group in groups for item in group}
+
+
+def interpolate(item, previous, alpha):
+    """Rect for a ship or bullet drawn `alpha` of the way from its position at the previous tick"""
+    entry = previous.get(position_key(item)) if previous else None
+    if entry is None:
+        return pygame.Rect(item.x, item.y, item.width, item.height)
+    x, y = entry
+    return pygame.Rect(round(x + (item.x - x) * alpha), round(y + (item.y - y) * alpha),
+                       item.width, item.height)
+
+
 def draw_window(red, yellow, red_bullets, yellow_bullets, red_health, yellow_health, 
-                yellow_thruster, red_thruster, bullet_trails, red_flash=0, yellow_flash=0):
-    global game_time, screen_shake_amount, particles, energy_rings
-    game_time += 1
-    
+                bullet_trails, red_flash=0, yellow_flash=0, alpha=1.0, previous=None):
+    """Render the match; `alpha` is how far between the previous tick and the current one to draw"""
     shake_x = int(random.uniform(-screen_shake_amount, screen_shake_amount)) if screen_shake_amount > 0.5 else 0
     shake_y = int(random.uniform(-screen_shake_amount, screen_shake_amount)) if screen_shake_amount > 0.5 else 0
-    screen_shake_amount *= screen_shake_decay
-    if screen_shake_amount < 0.5:
-        screen_shake_amount = 0
-    
-    temp_surface = pygame.Surface((WIDTH, HEIGHT))
+    dirty_rects.begin('game', (shake_x, shake_y))
     
-    draw_animated_background(temp_surface, game_time)
+    temp_surface = render_game_surface()
+    render_time = game_time - 1 + alpha
     
-    draw_neon_border(temp_surface, game_time)
+    draw_animated_background(temp_surface, render_time, shooting_star_chance=None)
     
-    for ring in energy_rings[:]:
-        ring.update()
-        if not ring.alive:
-            energy_rings.remove(ring)
-        else:
-            ring.draw(temp_surface)
+    draw_neon_border(temp_surface, render_time)
     
-    for particle in particles[:]:
-        particle.update()
-        if not particle.alive:
-            particles.remove(particle)
-        else:
-            particle.draw(temp_surface)
+    draw_effects(temp_surface)
     
-    yellow_thruster.ship = yellow
-    red_thruster.ship = red
-    yellow_thruster.update(True)
-    yellow_thruster.draw(temp_surface)
-    red_thruster.update(True)
-    red_thruster.draw(temp_surface)
+    bullet_trails.draw(temp_surface)
     
-    for trail in bullet_trails:
-        trail.update()
-        trail.draw(temp_surface)
+    red = interpolate(red, previous, alpha)
+    yellow = interpolate(yellow, previous, alpha)
     
     if yellow_flash > 0:
         flash_intensity = yellow_flash / 10
-        flash_surface = pygame.Surface((SPACESHIP_WIDTH + 10, SPACESHIP_HEIGHT + 10), pygame.SRCALPHA)
+        flash_surface = frame_buffers.get('flash', (SPACESHIP_WIDTH + 10, SPACESHIP_HEIGHT + 10), pygame.SRCALPHA)
         flash_surface.fill((255, 255, 200, int(150 * flash_intensity)))
-        temp_surface.blit(flash_surface, (yellow.x - 5, yellow.y - 5))
-    temp_surface.blit(YELLOW_SPACESHIP, (yellow.x, yellow.y))
+        dirty_rects.add(temp_surface.blit(flash_surface, (yellow.x - 5, yellow.y - 5)))
+    dirty_rects.add(temp_surface.blit(assets.get('yellow_ship'), (yellow.x, yellow.y)))
     
     if red_flash > 0:
         flash_intensity = red_flash / 10
-        flash_surface = pygame.Surface((SPACESHIP_WIDTH + 10, SPACESHIP_HEIGHT + 10), pygame.SRCALPHA)
+        flash_surface = frame_buffers.get('flash', (SPACESHIP_WIDTH + 10, SPACESHIP_HEIGHT + 10), pygame.SRCALPHA)
         flash_surface.fill((255, 200, 200, int(150 * flash_intensity)))
-        temp_surface.blit(flash_surface, (red.x - 5, red.y - 5))
-    temp_surface.blit(RED_SPACESHIP, (red.x, red.y))
+        dirty_rects.add(temp_surface.blit(flash_surface, (red.x - 5, red.y - 5)))
+    dirty_rects.add(temp_surface.blit(assets.get('red_ship'), (red.x, red.y)))
     
     for bullet in yellow_bullets:
-        draw_glow_rect(temp_surface, BRIGHT_YELLOW, bullet, glow_size=4)
+        draw_glow_rect(temp_surface, BRIGHT_YELLOW, interpolate(bullet, previous, alpha), glow_size=4)
     
     for bullet in red_bullets:
-        draw_glow_rect(temp_surface, BRIGHT_RED, bullet, glow_size=4)
-    
-    draw_health_bar(temp_surface, 15, 15, yellow_health, 10, 160, 22, YELLOW)
-    draw_neon_text(temp_surface, "YELLOW", SMALL_FONT, 15, 42, YELLOW)
-    
-    draw_health_bar(temp_surface, WIDTH - 175, 15, red_health, 10, 160, 22, RED)
-    draw_neon_text(temp_surface, "RED", SMALL_FONT, WIDTH - 45, 42, RED)
-    
-    yellow_ammo = MAX_BULLETS - len(yellow_bullets)
-    red_ammo = MAX_BULLETS - len(red_bullets)
+        draw_glow_rect(temp_surface, BRIGHT_RED, interpolate(bullet, previous, alpha), glow_size=4)
     
-    draw_ammo_display(temp_surface, 15, 65, yellow_ammo, MAX_BULLETS, YELLOW)
-    draw_ammo_display(temp_surface, WIDTH - 69, 65, red_ammo, MAX_BULLETS, RED)
+    hud.draw(temp_surface,
+             yellow_health=yellow_health, red_health=red_health,
+             yellow_ammo=MAX_BULLETS - len(yellow_bullets),
+             red_ammo=MAX_BULLETS - len(red_bullets))
+    draw_neon_text(temp_surface, "YELLOW", get_font('small'), 15, 42, YELLOW)
+    draw_neon_text(temp_surface, "RED", get_font('small'), WIDTH - 45, 42, RED)
     
-    game_surface = pygame.Surface((WIDTH, HEIGHT))
-    game_surface.blit(temp_surface, (shake_x, shake_y))
-    display_surface(game_surface)
+    display_surface(apply_screen_shake(temp_surface, shake_x, shake_y))
 
 
 def draw_winner(text, winner_color):
-    global game_time, particles, energy_rings
+    global game_time, energy_rings
     game_time += 1
+    dirty_rects.begin('winner')
     
     game_surface = render_game_surface()
     draw_animated_background(game_surface, game_time)
     draw_neon_border(game_surface, game_time)
     
-    for ring in energy_rings[:]:
-        ring.update()
-        if not ring.alive:
-            energy_rings.remove(ring)
-        else:
-            ring.draw(game_surface)
-    
-    for particle in particles[:]:
-        particle.update()
-        if not particle.alive:
-            particles.remove(particle)
-        else:
-            particle.draw(game_surface)
+    update_effects()
+    draw_effects(game_surface)
     
     box_width, box_height = 550, 220
     box_x = WIDTH//2 - box_width//2
@@ -847,29 +2099,27 @@ def draw_winner(text, winner_color):
         int(winner_color[2] * text_pulse)
     )
     
-    draw_neon_text(game_surface, text, WINNER_FONT,
-                   WIDTH//2 - WINNER_FONT.size(text)[0]//2,
-                   HEIGHT//2 - 50, pulse_color, glow_intensity=5)
+    draw_neon_text(game_surface, text, get_font('winner'),
+                   WIDTH//2 - get_font('winner').size(text)[0]//2,
+                   HEIGHT//2 - 50, pulse_color, glow_intensity=5, color_step=PULSE_COLOR_STEP)
     
     blink = int((math.sin(game_time * 0.12) + 1) * 60) + 135
-    restart_text = INSTRUCTION_FONT.render("R - Restart  |  F11 - Fullscreen  |  ESC - Quit", True, (blink, blink, blink))
-    game_surface.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50))
+    restart_text = get_font('instruction').render("R - Restart  |  F11 - Fullscreen  |  ESC - Quit", True, (blink, blink, blink))
+    dirty_rects.add(game_surface.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50)))
     
     display_surface(game_surface)
 
 
 def game_loop(control_scheme):
-    global particles, screen_shake_amount, energy_rings
+    global screen_shake_amount, energy_rings, game_time
     
-    red = pygame.Rect(700, 300, SPACESHIP_WIDTH, SPACESHIP_HEIGHT)
-    yellow = pygame.Rect(100, 300, SPACESHIP_WIDTH, SPACESHIP_HEIGHT)
-
-    red_bullets = []
-    yellow_bullets = []
-    bullet_trails = []
-
-    red_health = 10
-    yellow_health = 10
+    match = engine.Match()
+    red = match.red
+    yellow = match.yellow
+    red_bullets = red.bullets
+    yellow_bullets = yellow.bullets
+    bullet_trails = BulletTrails()
+    hud.reset()
     
     red_flash = 0
     yellow_flash = 0
@@ -877,79 +2127,88 @@ def game_loop(control_scheme):
     yellow_thruster = ThrusterFlame(yellow, facing_left=False)
     red_thruster = ThrusterFlame(red, facing_left=True)
     
-    particles = []
+    particles.clear()
+    thruster_particles.clear()
     energy_rings = []
 
+    winner_text = ""
+    winner_color = WHITE
+
+    game_events.reset()
+
+    @game_events.subscribe(engine.FIRE)
+    def on_fire(event):
+        bullet = event.bullet
+        if event.player == 'yellow':
+            bullet_trails.add(bullet, YELLOW)
+            create_muzzle_flash(bullet.x, bullet.y + 3, False)
+        else:
+            bullet_trails.add(bullet, RED)
+            create_muzzle_flash(bullet.x + bullet.width, bullet.y + 3, True)
+        play_sound('fire')
+
+    @game_events.subscribe(engine.HIT)
+    def on_hit(event):
+        nonlocal red_flash, yellow_flash
+        bullet_trails.detach(event.bullet.id)
+        if event.player == 'red':
+            red_flash = 12
+            create_hit_effect(red.x + red.width//2, red.y + red.height//2, ORANGE)
+        else:
+            yellow_flash = 12
+            create_hit_effect(yellow.x + yellow.width//2, yellow.y + yellow.height//2, YELLOW)
+        play_sound('hit')
+
+    @game_events.subscribe(engine.EXPIRE)
+    def on_expire(event):
+        bullet_trails.detach(event.bullet.id)
+
+    @game_events.subscribe(engine.DEATH)
+    def on_death(event):
+        if event.player == 'red':
+            create_victory_explosion(red.x + red.width//2, red.y + red.height//2, RED)
+        else:
+            create_victory_explosion(yellow.x + yellow.width//2, yellow.y + yellow.height//2, YELLOW)
+
+    @game_events.subscribe(engine.WIN)
+    def on_win(event):
+        nonlocal winner_text, winner_color
+        if event.player == 'yellow':
+            winner_text = "YELLOW WINS!"
+            winner_color = YELLOW
+        else:
+            winner_text = "RED WINS!"
+            winner_color = RED
+
     clock = pygame.time.Clock()
+    tick = 1 / TICK_RATE
+    accumulator = 0.0
+    previous = None
+    yellow_shots = 0
+    red_shots = 0
     run = True
     while run:
-        clock.tick(FPS)
-        
-        if red_flash > 0:
-            red_flash -= 1
-        if yellow_flash > 0:
-            yellow_flash -= 1
+        accumulator += min(clock.tick(RENDER_FPS) / 1000, MAX_FRAME_TIME)
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False, control_scheme
 
+            # Shots are handed to the engine on the next tick
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LCTRL and len(yellow_bullets) < MAX_BULLETS:
-                    bullet = pygame.Rect(yellow.x + yellow.width, yellow.y + yellow.height//2 - 3, 14, 7)
-                    yellow_bullets.append(bullet)
-                    bullet_trails.append(BulletTrail(bullet, YELLOW))
-                    create_muzzle_flash(bullet.x, bullet.y + 3, False)
-                    if AUDIO_ENABLED:
-                        BULLET_FIRE_SOUND.play()
-
-                if control_scheme == 1:
-                    if event.key == pygame.K_RCTRL and len(red_bullets) < MAX_BULLETS:
-                        bullet = pygame.Rect(red.x - 14, red.y + red.height//2 - 3, 14, 7)
-                        red_bullets.append(bullet)
-                        bullet_trails.append(BulletTrail(bullet, RED))
-                        create_muzzle_flash(bullet.x + 14, bullet.y + 3, True)
-                        if AUDIO_ENABLED:
-                            BULLET_FIRE_SOUND.play()
+                if event.key == pygame.K_LCTRL:
+                    yellow_shots += 1
+
+                if control_scheme == 1 and event.key == pygame.K_RCTRL:
+                    red_shots += 1
                 
                 # Fullscreen toggle
                 if event.key == pygame.K_F11 or event.key == pygame.K_f:
                     toggle_fullscreen()
             
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if control_scheme == 2 and event.button == 1 and len(red_bullets) < MAX_BULLETS:
-                    bullet = pygame.Rect(red.x - 14, red.y + red.height//2 - 3, 14, 7)
-                    red_bullets.append(bullet)
-                    bullet_trails.append(BulletTrail(bullet, RED))
-                    create_muzzle_flash(bullet.x + 14, bullet.y + 3, True)
-                    if AUDIO_ENABLED:
-                        BULLET_FIRE_SOUND.play()
-
-            if event.type == RED_HIT:
-                red_health -= 1
-                red_flash = 12
-                create_hit_effect(red.x + red.width//2, red.y + red.height//2, ORANGE)
-                if AUDIO_ENABLED:
-                    BULLET_HIT_SOUND.play()
-
-            if event.type == YELLOW_HIT:
-                yellow_health -= 1
-                yellow_flash = 12
-                create_hit_effect(yellow.x + yellow.width//2, yellow.y + yellow.height//2, YELLOW)
-                if AUDIO_ENABLED:
-                    BULLET_HIT_SOUND.play()
-
-        winner_text = ""
-        winner_color = WHITE
-        if red_health <= 0:
-            winner_text = "YELLOW WINS!"
-            winner_color = YELLOW
-            create_victory_explosion(red.x + red.width//2, red.y + red.height//2, RED)
-
-        if yellow_health <= 0:
-            winner_text = "RED WINS!"
-            winner_color = RED
-            create_victory_explosion(yellow.x + yellow.width//2, yellow.y + yellow.height//2, YELLOW)
+                if control_scheme == 2 and event.button == 1:
+                    red_shots += 1
 
         if winner_text != "":
             waiting = True
@@ -972,88 +2231,108 @@ def game_loop(control_scheme):
             break
 
         keys_pressed = pygame.key.get_pressed()
-        yellow_handle_movement(keys_pressed, yellow)
-        red_handle_movement(keys_pressed, red, control_scheme)
-
-        for bullet in yellow_bullets[:]:
-            bullet.x += BULLETS_VEL
-            if red.colliderect(bullet):
-                pygame.event.post(pygame.event.Event(RED_HIT))
-                yellow_bullets.remove(bullet)
-                bullet_trails = [t for t in bullet_trails if t.bullet != bullet]
-            elif bullet.x > WIDTH:
-                yellow_bullets.remove(bullet)
-                bullet_trails = [t for t in bullet_trails if t.bullet != bullet]
-
-        for bullet in red_bullets[:]:
-            bullet.x -= BULLETS_VEL
-            if yellow.colliderect(bullet):
-                pygame.event.post(pygame.event.Event(YELLOW_HIT))
-                red_bullets.remove(bullet)
-                bullet_trails = [t for t in bullet_trails if t.bullet != bullet]
-            elif bullet.x < 0:
-                red_bullets.remove(bullet)
-                bullet_trails = [t for t in bullet_trails if t.bullet != bullet]
+        while accumulator >= tick:
+            accumulator -= tick
+            previous = snapshot_positions((red, yellow), red_bullets, yellow_bullets)
+            game_time += 1
+            
+            if red_flash > 0:
+                red_flash -= 1
+            if yellow_flash > 0:
+                yellow_flash -= 1
+            
+            events = match.step(read_yellow_input(keys_pressed, yellow_shots),
+                                read_red_input(keys_pressed, control_scheme, red_shots))
+            yellow_shots = red_shots = 0
+            for event in events:
+                game_events.publish(event)
+            # End of the match tick: batched events are delivered before trails and effects advance
+            game_events.flush()
+            
+            bullet_trails.update(yellow_bullets, red_bullets)
+            hud.advance(yellow_health=yellow.health, red_health=red.health)
+            yellow_thruster.update(True, tick)
+            red_thruster.update(True, tick)
+            update_effects()
+            update_shooting_stars()
+            
+            screen_shake_amount *= screen_shake_decay
+            if screen_shake_amount < 0.5:
+                screen_shake_amount = 0
+            # Emitters run once per tick here, so each tick gets the full per-frame caps
+            particle_budget.next_frame()
 
         draw_window(red, yellow, red_bullets, yellow_bullets,
-                    red_health, yellow_health, yellow_thruster, red_thruster,
-                    bullet_trails, red_flash, yellow_flash)
+                    red.health, yellow.health, bullet_trails,
+                    red_flash, yellow_flash, accumulator / tick, previous)
 
     return True, control_scheme
 
 
-def yellow_handle_movement(keys_pressed, yellow):
-    if keys_pressed[pygame.K_a] and yellow.x - VEL > 0:
-        yellow.x -= VEL
-    if keys_pressed[pygame.K_d] and yellow.x + VEL + yellow.width < BORDER.x:
-        yellow.x += VEL
-    if keys_pressed[pygame.K_w] and yellow.y - VEL > 0:
-        yellow.y -= VEL
-    if keys_pressed[pygame.K_s] and yellow.y + VEL + yellow.height < HEIGHT - 15:
-        yellow.y += VEL
+def read_yellow_input(keys_pressed, shots):
+    return engine.PlayerInput(keys_pressed[pygame.K_a], keys_pressed[pygame.K_d],
+                              keys_pressed[pygame.K_w], keys_pressed[pygame.K_s], shots)
 
 
-def red_handle_movement(keys_pressed, red, control_scheme):
+def read_red_input(keys_pressed, control_scheme, shots):
     if control_scheme == 1:
-        if keys_pressed[pygame.K_LEFT] and red.x - VEL > BORDER.x + BORDER.width:
-            red.x -= VEL
-        if keys_pressed[pygame.K_RIGHT] and red.x + VEL + red.width < WIDTH:
-            red.x += VEL
-        if keys_pressed[pygame.K_UP] and red.y - VEL > 0:
-            red.y -= VEL
-        if keys_pressed[pygame.K_DOWN] and red.y + VEL + red.height < HEIGHT - 15:
-            red.y += VEL
-    else:
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        
-        # Adjust mouse position if in fullscreen mode
-        if FULLSCREEN:
-            screen_w, screen_h = WIN.get_size()
-            scale_factor = min(screen_w / WIDTH, screen_h / HEIGHT)
-            scaled_w = int(WIDTH * scale_factor)
-            scaled_h = int(HEIGHT * scale_factor)
-            x_offset = (screen_w - scaled_w) // 2
-            y_offset = (screen_h - scaled_h) // 2
-            
-            mouse_x = int((mouse_x - x_offset) / scale_factor)
-            mouse_y = int((mouse_y - y_offset) / scale_factor)
-        
-        red_center_x = red.x + red.width // 2
-        red_center_y = red.y + red.height // 2
-        
-        if mouse_x > BORDER.x + BORDER.width:
-            if red_center_x < mouse_x - 10 and red.x + VEL + red.width < WIDTH:
-                red.x += VEL
-            elif red_center_x > mouse_x + 10 and red.x - VEL > BORDER.x + BORDER.width:
-                red.x -= VEL
-            
-            if red_center_y < mouse_y - 10 and red.y + VEL + red.height < HEIGHT - 15:
-                red.y += VEL
-            elif red_center_y > mouse_y + 10 and red.y - VEL > 0:
-                red.y -= VEL
+        return engine.PlayerInput(keys_pressed[pygame.K_LEFT], keys_pressed[pygame.K_RIGHT],
+                                  keys_pressed[pygame.K_UP], keys_pressed[pygame.K_DOWN], shots)
+    return engine.PlayerInput(fire=shots, target=viewport.to_game(pygame.mouse.get_pos()))
+
+
+def startup(timings=None):
+    """Open the window, which loads and converts the images through the display-change hooks.
+
+    The images and then the sounds load on the loader thread; fonts and the
+    star field are created on first use.
+    """
+    init_display(timings)
+    # SDL audio has to start on the main thread; only decoding goes to the loader
+    audio_enabled()
+    preload_sounds()
+
+
+def profile_startup():
+    """Print how long each phase takes from import to the first frame on screen"""
+    timings = [('imports and module setup', time.perf_counter() - module_started)]
+    hook_names = {getattr(hook, '__qualname__', repr(hook)) for hook in display_change_hooks}
+
+    def phase(name, run):
+        started = time.perf_counter()
+        run()
+        timings.append((name, time.perf_counter() - started))
+
+    startup(timings)
+    phase('fonts', lambda: [get_font(name) for name in FONTS])
+    phase('star field', get_star_field)
+    phase('first frame', draw_control_scheme_screen)
+    to_first_frame = sum(seconds for _, seconds in timings)
+    phase('rest of background loading', loader.wait)
+
+    print("%-32s %9s" % ("phase", "ms"))
+    # Most display-change hooks only drop caches; fold those into one line
+    folded = [(name, seconds) for name, seconds in timings[:-1] if name in hook_names and seconds < 0.001]
+    for name, seconds in timings[:-1]:
+        if folded and (name, seconds) == folded[0]:
+            name, seconds = "other display hooks", sum(seconds for _, seconds in folded)
+        elif (name, seconds) in folded:
+            continue
+        print("%-32s %9.2f" % (name, seconds * 1000))
+    print("%-32s %9.2f%s" % ("time to first frame", to_first_frame * 1000,
+                             "" if to_first_frame <= FIRST_FRAME_BUDGET else "  (over budget)"))
+    name, seconds = timings[-1]
+    print("%-32s %9.2f" % (name, seconds * 1000))
+    
+    print()
+    print("%-32s %9s" % ("asset (loader thread)", "ms"))
+    for name, seconds in sorted(loader.times.items(), key=lambda item: -item[1]):
+        print("%-32s %9.2f" % (name, seconds * 1000))
+    pygame.quit()
 
 
 def main():
+    startup()
     clock = pygame.time.Clock()
     control_scheme = 1
     
@@ -1139,4 +2418,14 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="SPACE BATTLE - Neon Edition")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print a per-phase breakdown of time to first frame and exit")
+    parser.add_argument('--fps', type=int, default=RENDER_FPS,
+                        help="frame cap during a match, 0 for uncapped (default %(default)s)")
+    args = parser.parse_args()
+    RENDER_FPS = args.fps
+    if args.profile_startup:
+        profile_startup()
+    else:
+        main()
@@ -0,0 +1,171 @@
+"""Engine rule checks: Match against the original Rect-based game rules, MatchBatch
+against Match, and the grid broadphase against a brute-force overlap test.
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import engine  # noqa: E402
+
+VEL = 5
+BORDER = pygame.Rect(engine.BORDER_X, 0, engine.BORDER_WIDTH, engine.HEIGHT)
+WIDTH, HEIGHT = engine.WIDTH, engine.HEIGHT
+
+
+class RectRules:
+    """The match rules as main.py ran them before the engine existed, on pygame.Rects"""
+    def __init__(self):
+        self.yellow = pygame.Rect(100, 300, 55, 40)
+        self.red = pygame.Rect(700, 300, 55, 40)
+        self.yellow_bullets = []
+        self.red_bullets = []
+        self.yellow_health = 10
+        self.red_health = 10
+        self.tick = 0
+
+    def step(self, yellow_keys, red_keys, yellow_fire, red_fire, mouse=None):
+        self.tick += 1
+        yellow, red = self.yellow, self.red
+        if yellow_fire and len(self.yellow_bullets) < 3:
+            self.yellow_bullets.append(pygame.Rect(yellow.x + yellow.width, yellow.y + yellow.height//2 - 3, 14, 7))
+        if red_fire and len(self.red_bullets) < 3:
+            self.red_bullets.append(pygame.Rect(red.x - 14, red.y + red.height//2 - 3, 14, 7))
+
+        left, right, up, down = yellow_keys
+        if left and yellow.x - VEL > 0:
+            yellow.x -= VEL
+        if right and yellow.x + VEL + yellow.width < BORDER.x:
+            yellow.x += VEL
+        if up and yellow.y - VEL > 0:
+            yellow.y -= VEL
+        if down and yellow.y + VEL + yellow.height < HEIGHT - 15:
+            yellow.y += VEL
+
+        if mouse is None:
+            left, right, up, down = red_keys
+            if left and red.x - VEL > BORDER.x + BORDER.width:
+                red.x -= VEL
+            if right and red.x + VEL + red.width < WIDTH:
+                red.x += VEL
+            if up and red.y - VEL > 0:
+                red.y -= VEL
+            if down and red.y + VEL + red.height < HEIGHT - 15:
+                red.y += VEL
+        else:
+            mouse_x, mouse_y = mouse
+            center_x = red.x + red.width // 2
+            center_y = red.y + red.height // 2
+            if mouse_x > BORDER.x + BORDER.width:
+                if center_x < mouse_x - 10 and red.x + VEL + red.width < WIDTH:
+                    red.x += VEL
+                elif center_x > mouse_x + 10 and red.x - VEL > BORDER.x + BORDER.width:
+                    red.x -= VEL
+                if center_y < mouse_y - 10 and red.y + VEL + red.height < HEIGHT - 15:
+                    red.y += VEL
+                elif center_y > mouse_y + 10 and red.y - VEL > 0:
+                    red.y -= VEL
+
+        for bullet in self.yellow_bullets[:]:
+            bullet.x += 10
+            if red.colliderect(bullet):
+                self.red_health -= 1
+                self.yellow_bullets.remove(bullet)
+            elif bullet.x > WIDTH:
+                self.yellow_bullets.remove(bullet)
+        for bullet in self.red_bullets[:]:
+            bullet.x -= 10
+            if yellow.colliderect(bullet):
+                self.yellow_health -= 1
+                self.red_bullets.remove(bullet)
+            elif bullet.x < 0:
+                self.red_bullets.remove(bullet)
+
+    def snapshot(self):
+        return (self.tick,
+                ((self.yellow.x, self.yellow.y, self.yellow_health,
+                  tuple(sorted((b.x, b.y) for b in self.yellow_bullets))),
+                 (self.red.x, self.red.y, self.red_health,
+                  tuple(sorted((b.x, b.y) for b in self.red_bullets)))))
+
+
+def test_match_follows_rect_rules():
+    rng = random.Random(1)
+    for game in range(60):
+        mouse_scheme = game % 2 == 1
+        match = engine.Match()
+        reference = RectRules()
+        for _ in range(3000):
+            yellow_keys = [rng.random() < 0.5 for _ in range(4)]
+            red_keys = [rng.random() < 0.5 for _ in range(4)]
+            yellow_fire = rng.random() < 0.1
+            red_fire = rng.random() < 0.1
+            mouse = (rng.randint(0, WIDTH), rng.randint(0, HEIGHT)) if mouse_scheme else None
+
+            reference.step(yellow_keys, red_keys, yellow_fire, red_fire, mouse)
+            if mouse_scheme:
+                red_input = engine.PlayerInput(fire=red_fire, target=mouse)
+            else:
+                red_input = engine.PlayerInput(*red_keys, fire=red_fire)
+            match.step(engine.PlayerInput(*yellow_keys, fire=yellow_fire), red_input)
+
+            assert match.snapshot() == reference.snapshot(), (game, match.tick)
+            if reference.yellow_health <= 0 or reference.red_health <= 0:
+                assert match.winner == ('red' if reference.yellow_health <= 0 else 'yellow')
+                break
+
+
+def player_input(actions, target=None):
+    if target is not None:
+        return engine.PlayerInput(fire=int(actions[engine.SHOOT]), target=target)
+    return engine.PlayerInput(*map(bool, actions[:4]), fire=int(actions[engine.SHOOT]))
+
+
+def test_match_batch_agrees_with_match():
+    rng = np.random.default_rng(5)
+    n = 64
+    batch = engine.MatchBatch(n)
+    matches = [engine.Match() for _ in range(n)]
+    follow = rng.random(n) < 0.5
+    finished = 0
+    for tick in range(4000):
+        yellow_actions = (rng.random((n, 5)) < [0.5, 0.5, 0.5, 0.5, 0.15]).astype(np.int32)
+        red_actions = (rng.random((n, 5)) < [0.5, 0.5, 0.5, 0.5, 0.15]).astype(np.int32)
+        yellow_actions[:, engine.SHOOT] *= rng.integers(1, 3, n)
+        targets = np.stack([rng.integers(0, WIDTH, n), rng.integers(0, HEIGHT, n)], axis=1)
+        hits, winner = batch.step(yellow_actions, red_actions, targets, follow)
+
+        for i, match in enumerate(matches):
+            target = (int(targets[i, 0]), int(targets[i, 1])) if follow[i] else None
+            events = match.step(player_input(yellow_actions[i]), player_input(red_actions[i], target))
+            expected_hits = [sum(1 for event in events if event.kind == engine.HIT and event.player == side)
+                             for side in ('yellow', 'red')]
+            assert hits[i].tolist() == expected_hits, (tick, i)
+            if match.winner is None:
+                assert winner[i] == engine.NO_WINNER, (tick, i)
+                assert batch.snapshot(i) == match.snapshot(), (tick, i)
+            else:
+                assert winner[i] == (engine.YELLOW_WINS if match.winner == 'yellow' else engine.RED_WINS), (tick, i)
+                matches[i] = engine.Match()
+                finished += 1
+    assert finished > 0
+    assert batch.matches_played == finished
+
+
+def test_overlapping_pairs_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        count_a, count_b = rng.integers(0, 80, 2)
+        a = np.stack([rng.integers(-20, WIDTH + 20, count_a), rng.integers(-10, HEIGHT + 10, count_a)], 1)
+        b = np.stack([rng.integers(-20, WIDTH + 20, count_b), rng.integers(-10, HEIGHT + 10, count_b)], 1)
+        size_a = (int(rng.integers(1, 70)), int(rng.integers(1, 50)))
+        size_b = (engine.BULLET_WIDTH, engine.BULLET_HEIGHT)
+        i, j = engine.overlapping_pairs(a, size_a, b, size_b, cell=int(rng.integers(8, 64)))
+        expected = {(p, q) for p in range(count_a) for q in range(count_b)
+                    if pygame.Rect(a[p].tolist(), size_a).colliderect(pygame.Rect(b[q].tolist(), size_b))}
+        assert set(zip(i.tolist(), j.tolist())) == expected, trial
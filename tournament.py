@@ -0,0 +1,276 @@
+"""Bot-vs-bot tournaments on the headless engine, spread across processes.
+
+    python tournament.py --bots random,chaser,dodger --games 20
+    python tournament.py --format swiss --rounds 6 --bots chaser,dodger,random,idle
+
+A bot is a class taking (side, rng) whose act(match) returns an
+engine.PlayerInput for its side each tick. Built-in bots are listed in BOTS;
+any other bot can be given as "module:Class". Every match gets a seed derived
+from --seed and its index, so a tournament replays identically however the
+matches are spread over the workers.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import engine
+
+# A match still running after this many ticks (3 minutes at 60 ticks/s) is a draw
+MAX_TICKS = 60 * 60 * 3
+ELO_START = 1500
+ELO_K = 32
+MODES = {
+    'classic': engine.Match,
+    'hell': engine.BulletHellMatch,
+}
+
+
+class Bot:
+    """Base class: keeps the side and seeded rng and resolves the bot's own and the enemy ship"""
+    def __init__(self, side, rng):
+        self.side = side
+        self.rng = rng
+
+    def ships(self, match):
+        if self.side == 'yellow':
+            return match.yellow, match.red
+        return match.red, match.yellow
+
+    def act(self, match):
+        return engine.NO_INPUT
+
+
+class IdleBot(Bot):
+    pass
+
+
+class RandomBot(Bot):
+    """Mashes random directions and fires now and then"""
+    def act(self, match):
+        rng = self.rng
+        return engine.PlayerInput(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.5,
+                                  rng.random() < 0.5, rng.random() < 0.1)
+
+
+class ChaserBot(Bot):
+    """Lines up with the enemy ship and fires whenever it is level with it"""
+    def act(self, match):
+        me, enemy = self.ships(match)
+        dy = enemy.y - me.y
+        aligned = abs(dy) < engine.SPACESHIP_HEIGHT // 2
+        return engine.PlayerInput(up=dy < 0, down=dy > 0, fire=aligned and self.rng.random() < 0.3)
+
+
+class DodgerBot(Bot):
+    """Steps out of the row of the nearest incoming bullet, otherwise chases"""
+    def act(self, match):
+        me, enemy = self.ships(match)
+        incoming = None
+        for bullet in enemy.bullets:
+            if me.y - engine.BULLET_HEIGHT < bullet.y < me.y + me.height:
+                if incoming is None or abs(bullet.x - me.x) < abs(incoming.x - me.x):
+                    incoming = bullet
+        if incoming is not None:
+            dodge_up = incoming.y > me.y + me.height // 2
+            return engine.PlayerInput(up=dodge_up, down=not dodge_up, fire=self.rng.random() < 0.05)
+        dy = enemy.y - me.y
+        return engine.PlayerInput(up=dy < 0, down=dy > 0, fire=abs(dy) < engine.SPACESHIP_HEIGHT)
+
+
+BOTS = {
+    'idle': IdleBot,
+    'random': RandomBot,
+    'chaser': ChaserBot,
+    'dodger': DodgerBot,
+}
+
+
+def load_bot(name):
+    """A BOTS entry, or a "module:Class" path to any other bot"""
+    if name in BOTS:
+        return BOTS[name]
+    module, _, attr = name.partition(':')
+    if not attr:
+        raise ValueError("unknown bot %r (built-in: %s, or module:Class)" % (name, ', '.join(BOTS)))
+    return getattr(importlib.import_module(module), attr)
+
+
+def play_match(index, yellow_name, red_name, seed, max_ticks=MAX_TICKS, mode='classic'):
+    """Play one headless match; runs in a worker process and returns a plain dict"""
+    yellow_bot = load_bot(yellow_name)('yellow', random.Random(seed * 2))
+    red_bot = load_bot(red_name)('red', random.Random(seed * 2 + 1))
+    match = MODES[mode]()
+    hits = {'yellow': 0, 'red': 0}
+    while match.winner is None and match.tick < max_ticks:
+        for event in match.step(yellow_bot.act(match), red_bot.act(match)):
+            if event.kind == engine.HIT:
+                hits[event.player] += 1
+    return {
+        'index': index,
+        'seed': seed,
+        'yellow': yellow_name,
+        'red': red_name,
+        'winner': match.winner,
+        'ticks': match.tick,
+        'hits_taken': hits,
+    }
+
+
+def round_robin(bots, games):
+    """Every bot against every other bot, `games` times on each side"""
+    return [(yellow, red) for yellow in bots for red in bots if yellow != red for _ in range(games)]
+
+
+def swiss_pairings(bots, scores, played, round_number):
+    """Pair bots with similar scores, avoiding rematches where possible; sides alternate by round"""
+    order = sorted(bots, key=lambda bot: (-scores[bot], bots.index(bot)))
+    pairs = []
+    while len(order) > 1:
+        first = order.pop(0)
+        opponent = next((bot for bot in order if frozenset((first, bot)) not in played), order[0])
+        order.remove(opponent)
+        played.add(frozenset((first, opponent)))
+        pairs.append((first, opponent) if round_number % 2 == 0 else (opponent, first))
+    return pairs
+
+
+def play_chunk(jobs, max_ticks, mode):
+    return [play_match(index, yellow, red, seed, max_ticks, mode) for index, yellow, red, seed in jobs]
+
+
+def run_matches(executor, workers, pairings, seed, first_index, max_ticks, mode, results, on_result):
+    """Play `pairings` on the pool and report each result as its chunk finishes.
+
+    Matches are sent in chunks (about eight per worker) so the per-task pickling
+    cost stays small next to the work.
+    """
+    jobs = [(first_index + i, yellow, red, seed + first_index + i) for i, (yellow, red) in enumerate(pairings)]
+    size = max(1, -(-len(jobs) // (workers * 8)))
+    futures = [executor.submit(play_chunk, jobs[start:start + size], max_ticks, mode)
+               for start in range(0, len(jobs), size)]
+    for future in as_completed(futures):
+        for result in future.result():
+            results.append(result)
+            on_result(result)
+
+
+def elo_ratings(bots, results):
+    """Elo from the results in match-index order, so ratings don't depend on completion order"""
+    ratings = dict.fromkeys(bots, float(ELO_START))
+    for result in sorted(results, key=lambda result: result['index']):
+        yellow, red = result['yellow'], result['red']
+        expected = 1 / (1 + 10 ** ((ratings[red] - ratings[yellow]) / 400))
+        score = {'yellow': 1.0, 'red': 0.0, None: 0.5}[result['winner']]
+        ratings[yellow] += ELO_K * (score - expected)
+        ratings[red] -= ELO_K * (score - expected)
+    return ratings
+
+
+def summarize(bots, results):
+    ratings = elo_ratings(bots, results)
+    table = {}
+    for bot in bots:
+        row = {'games': 0, 'wins': 0, 'losses': 0, 'draws': 0,
+               'wins_as_yellow': 0, 'games_as_yellow': 0, 'wins_as_red': 0, 'games_as_red': 0}
+        for result in results:
+            for side in ('yellow', 'red'):
+                if result[side] != bot:
+                    continue
+                row['games'] += 1
+                row['games_as_' + side] += 1
+                if result['winner'] is None:
+                    row['draws'] += 1
+                elif result['winner'] == side:
+                    row['wins'] += 1
+                    row['wins_as_' + side] += 1
+                else:
+                    row['losses'] += 1
+        row['win_rate'] = row['wins'] / row['games'] if row['games'] else 0.0
+        row['elo'] = round(ratings[bot], 1)
+        table[bot] = row
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a bot tournament on the headless engine")
+    parser.add_argument('--bots', default=','.join(BOTS),
+                        help="comma-separated bot names or module:Class paths (default: %(default)s)")
+    parser.add_argument('--format', choices=('round-robin', 'swiss'), default='round-robin')
+    parser.add_argument('--mode', choices=sorted(MODES), default='classic',
+                        help="match rules; hell is the bullet-hell variant (default %(default)s)")
+    parser.add_argument('--games', type=int, default=10,
+                        help="round-robin games per pairing and side (default %(default)s)")
+    parser.add_argument('--rounds', type=int, default=5, help="swiss rounds (default %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: all cores)")
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS,
+                        help="ticks before a match is a draw (default %(default)s)")
+    parser.add_argument('--summary', default='tournament_summary.json',
+                        help="where to write the JSON summary (default %(default)s)")
+    parser.add_argument('--quiet', action='store_true', help="don't print each result as it arrives")
+    args = parser.parse_args()
+
+    bots = [name.strip() for name in args.bots.split(',') if name.strip()]
+    if len(bots) < 2:
+        parser.error("a tournament needs at least two bots")
+    for bot in bots:
+        try:
+            load_bot(bot)
+        except (ValueError, ImportError, AttributeError) as error:
+            parser.error(str(error))
+
+    results = []
+    started = time.perf_counter()
+
+    def on_result(result):
+        if not args.quiet:
+            winner = result[result['winner']] if result['winner'] else 'draw'
+            print("#%-5d %-12s vs %-12s -> %-12s %6d ticks" % (
+                result['index'], result['yellow'], result['red'], winner, result['ticks']), flush=True)
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        if args.format == 'round-robin':
+            run_matches(executor, args.workers, round_robin(bots, args.games), args.seed, 0,
+                        args.max_ticks, args.mode, results, on_result)
+        else:
+            played = set()
+            for round_number in range(args.rounds):
+                scores = {bot: row['wins'] + row['draws'] / 2 for bot, row in summarize(bots, results).items()}
+                pairings = swiss_pairings(bots, scores, played, round_number)
+                run_matches(executor, args.workers, pairings, args.seed, len(results), args.max_ticks,
+                            args.mode, results, on_result)
+    elapsed = time.perf_counter() - started
+
+    table = summarize(bots, results)
+    ticks = sum(result['ticks'] for result in results)
+    summary = {
+        'format': args.format,
+        'mode': args.mode,
+        'seed': args.seed,
+        'workers': args.workers,
+        'matches': len(results),
+        'ticks': ticks,
+        'seconds': round(elapsed, 3),
+        'ticks_per_second': round(ticks / elapsed) if elapsed else None,
+        'bots': table,
+        'results': sorted(results, key=lambda result: result['index']),
+    }
+    with open(args.summary, 'w') as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+    print()
+    print("%-14s %6s %6s %6s %6s %8s %8s" % ("bot", "games", "wins", "losses", "draws", "win %", "elo"))
+    for bot, row in sorted(table.items(), key=lambda item: -item[1]['elo']):
+        print("%-14s %6d %6d %6d %6d %7.1f%% %8.1f" % (
+            bot, row['games'], row['wins'], row['losses'], row['draws'], row['win_rate'] * 100, row['elo']))
+    print("%d matches, %d ticks in %.2fs on %d workers (%.0f ticks/s); summary written to %s" % (
+        len(results), ticks, elapsed, args.workers, summary['ticks_per_second'] or 0, args.summary))
+
+
+if __name__ == '__main__':
+    main()